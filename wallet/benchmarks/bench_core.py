@@ -0,0 +1,96 @@
+from re import compile
+from typing import Callable, List
+from uuid import uuid4
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from wallet.core.entity.transaction import Transaction, TransactionBuilder
+from wallet.core.entity.wallet import Wallet, WalletBuilder
+from wallet.core.tool.calculator import FeeCalculator
+from wallet.core.tool.validator import DefaultValidator
+from wallet.infra.repository.sqlite.transaction_repository import to_transaction
+from wallet.infra.repository.sqlite.user_repository import to_user
+from wallet.infra.repository.sqlite.wallet_repository import to_wallet
+
+TRANSACTION_ROW = (str(uuid4()), str(uuid4()), str(uuid4()), 1_000_000, 15_000)
+WALLET_ROW = (str(uuid4()), 100_000_000, str(uuid4()))
+USER_ROW = (str(uuid4()), "user@gmail.com", str(uuid4()))
+UNIQUE_SIGNUP_EMAILS = [f"user{i}@gmail.com" for i in range(10_000)]
+REPEATED_SIGNUP_EMAILS = [f"user{i % 2_000}@gmail.com" for i in range(10_000)]
+
+
+def recompiling_is_valid_email(email: str) -> bool:
+    return compile(DefaultValidator.EMAIL_REGEX).match(email) is not None
+
+
+def validate_signup_storm(
+    is_valid_email: Callable[[str], bool], emails: List[str]
+) -> List[bool]:
+    return [is_valid_email(email) for email in emails]
+
+
+def build_transaction() -> Transaction:
+    return (
+        TransactionBuilder()
+        .builder()
+        .from_address("from")
+        .to_address("to")
+        .amount(1_000_000)
+        .fee(15_000)
+        .build()
+    )
+
+
+def build_wallet() -> Wallet:
+    return WalletBuilder().builder().address("address").amount(100_000_000).build()
+
+
+@pytest.mark.parametrize("amount", [1, 1_000_000, 100_000_000])
+def test_calculate_fee(benchmark: BenchmarkFixture, amount: int) -> None:
+    assert benchmark(FeeCalculator.calculate_fee, amount) >= 1
+
+
+@pytest.mark.parametrize(
+    "email", ["user@gmail.com", "first.last+tag@sub.example.co.uk", "not-an-email"]
+)
+def test_is_valid_email(benchmark: BenchmarkFixture, email: str) -> None:
+    benchmark(DefaultValidator.is_valid_email, email)
+
+
+@pytest.mark.parametrize(
+    "is_valid_email",
+    [recompiling_is_valid_email, DefaultValidator.is_valid_email],
+    ids=["recompiling", "precompiled_cached"],
+)
+@pytest.mark.parametrize(
+    "emails",
+    [UNIQUE_SIGNUP_EMAILS, REPEATED_SIGNUP_EMAILS],
+    ids=["unique", "repeated"],
+)
+def test_signup_storm_email_validation(
+    benchmark: BenchmarkFixture,
+    is_valid_email: Callable[[str], bool],
+    emails: List[str],
+) -> None:
+    assert all(benchmark(validate_signup_storm, is_valid_email, emails))
+
+
+def test_transaction_builder(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(build_transaction).amount == 1_000_000
+
+
+def test_wallet_builder(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(build_wallet).amount == 100_000_000
+
+
+def test_to_transaction(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(to_transaction, TRANSACTION_ROW).fee == 15_000
+
+
+def test_to_wallet(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(to_wallet, WALLET_ROW).amount == 100_000_000
+
+
+def test_to_user(benchmark: BenchmarkFixture) -> None:
+    assert benchmark(to_user, USER_ROW).email == "user@gmail.com"
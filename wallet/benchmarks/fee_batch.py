@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+from array import array
+from typing import Any, Callable, Dict, Sequence
+
+from typer import Option, Typer
+
+from wallet.core.tool.calculator import FeeCalculator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment, unused-ignore]
+
+MAX_AMOUNT = 100_000_000_000
+
+cli = Typer(add_completion=False)
+
+
+def scalar_fees(amounts: Sequence[int]) -> Sequence[int]:
+    return [FeeCalculator.calculate_fee(amount) for amount in amounts]
+
+
+def timed(function: Callable[[], Sequence[int]]) -> tuple[float, Sequence[int]]:
+    started = time.perf_counter()
+    fees = function()
+    return time.perf_counter() - started, fees
+
+
+@cli.command()
+def run(count: int = Option(10_000_000, min=1), seed: int = 0) -> None:
+    rng = random.Random(seed)
+    amounts = array("q", (rng.randrange(1, MAX_AMOUNT) for _ in range(count)))
+    inputs: Dict[str, Any] = {"list": amounts.tolist(), "array": amounts}
+    if numpy is not None:
+        inputs["numpy"] = numpy.frombuffer(amounts, dtype=numpy.int64)
+
+    elapsed, expected = timed(lambda: scalar_fees(inputs["list"]))
+    print(json.dumps({"amounts": count, "mode": "scalar", "seconds": elapsed}))
+    for mode, values in inputs.items():
+        elapsed, fees = timed(lambda: FeeCalculator.calculate_fees(values))
+        print(
+            json.dumps(
+                {
+                    "amounts": count,
+                    "mode": f"batch_{mode}",
+                    "numpy": numpy is not None,
+                    "seconds": elapsed,
+                    "identical": list(fees) == list(expected),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    cli()
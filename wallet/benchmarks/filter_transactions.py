@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import time
+from contextlib import closing
+from typing import List
+from uuid import uuid4
+
+from typer import Option, Typer
+
+from wallet.core.entity.wallet import WalletBuilder
+from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
+from wallet.infra.repository.sqlite.transaction_repository import (
+    TRANSACTION_TABLE_NAME,
+    TransactionRepository,
+)
+
+TRANSACTIONS_PER_WALLET = 20
+SAMPLE_WALLETS = 200
+INSERT_CHUNK = 100_000
+
+cli = Typer(add_completion=False)
+
+
+def populate(count: int, wallet_count: int, rng: random.Random) -> None:
+    conn = ConnectionManager.get_connection()
+    with closing(conn.cursor()) as cursor:
+        for start in range(0, count, INSERT_CHUNK):
+            rows = [
+                (
+                    str(uuid4()),
+                    f"address_{rng.randrange(wallet_count)}",
+                    f"address_{rng.randrange(wallet_count)}",
+                    rng.randrange(1, 1_000_000),
+                    1,
+                )
+                for _ in range(min(INSERT_CHUNK, count - start))
+            ]
+            cursor.executemany(
+                f"INSERT INTO {TRANSACTION_TABLE_NAME} VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+
+def measure(
+    repository: TransactionRepository, wallet_count: int, rng: random.Random
+) -> List[float]:
+    latencies = []
+    for _ in range(SAMPLE_WALLETS):
+        wallet = (
+            WalletBuilder()
+            .builder()
+            .address(f"address_{rng.randrange(wallet_count)}")
+            .build()
+        )
+        started = time.perf_counter()
+        repository.filter_transactions(wallet)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+@cli.command()
+def run(
+    sizes: List[int] = Option([10_000, 100_000, 1_000_000]),
+    seed: int = 0,
+) -> None:
+    ConnectionManager.set_in_mem(True)
+    ConnectionManager.set_foreign_keys(False)
+    rng = random.Random(seed)
+    for size in sizes:
+        repository = TransactionRepository()
+        wallet_count = max(size // TRANSACTIONS_PER_WALLET, 1)
+        populate(size, wallet_count, rng)
+        latencies = measure(repository, wallet_count, rng)
+        print(
+            json.dumps(
+                {
+                    "transactions": size,
+                    "wallets": wallet_count,
+                    "median_ms": round(statistics.median(latencies), 4),
+                    "max_ms": round(max(latencies), 4),
+                }
+            )
+        )
+        repository.tear_down()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import statistics
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from typer import Exit, Option, Typer
+
+from wallet.core.tool.rate_provider import StubFeed
+from wallet.infra.fastapi.statistics_api import admin_api_key
+from wallet.infra.repository.sqlite.connection_manager import (
+    REQUEST_DURABILITY,
+    ConnectionManager,
+)
+from wallet.runner.setup import MEMORY_BACKEND, SQLITE_BACKEND, setup
+
+BTC_TO_USD = 30_000.0
+WALLETS_PER_USER = 3
+LISTING_TRANSACTIONS = 300
+TRANSFER_AMOUNT = 100
+
+Scenario = Callable[[TestClient, int], Iterator[Callable[[], Any]]]
+
+cli = Typer(add_completion=False)
+
+
+def create_user(client: TestClient, email: str) -> Dict[str, str]:
+    response = client.post("/users/", json={"email": email})
+    return {"X-API-KEY": response.json()["api_key"]}
+
+
+def create_wallet(client: TestClient, headers: Dict[str, str]) -> str:
+    address: str = client.post("/wallets/", headers=headers).json()["address"]
+    return address
+
+
+def transfer(
+    client: TestClient, headers: Dict[str, str], sender: str, receiver: str
+) -> Any:
+    return client.post(
+        "/transactions/",
+        headers=headers,
+        json={
+            "sender_wallet_address": sender,
+            "receiver_wallet_address": receiver,
+            "amount": TRANSFER_AMOUNT,
+        },
+    )
+
+
+def signup_storm(client: TestClient, count: int) -> Iterator[Callable[[], Any]]:
+    for i in range(count):
+        yield partial(create_user, client, f"signup{i}@bench.com")
+
+
+def wallet_creation(client: TestClient, count: int) -> Iterator[Callable[[], Any]]:
+    for i in range(count):
+        if i % WALLETS_PER_USER == 0:
+            headers = create_user(client, f"wallets{i}@bench.com")
+        yield partial(create_wallet, client, headers)
+
+
+def transfer_loop(client: TestClient, count: int) -> Iterator[Callable[[], Any]]:
+    sender = create_user(client, "sender@bench.com")
+    receiver = create_user(client, "receiver@bench.com")
+    sender_wallet = create_wallet(client, sender)
+    receiver_wallet = create_wallet(client, receiver)
+    for i in range(count):
+        if i % 2 == 0:
+            yield partial(transfer, client, sender, sender_wallet, receiver_wallet)
+        else:
+            yield partial(transfer, client, receiver, receiver_wallet, sender_wallet)
+
+
+def listing(client: TestClient, count: int) -> Iterator[Callable[[], Any]]:
+    headers = create_user(client, "listing@bench.com")
+    wallets = [create_wallet(client, headers) for _ in range(WALLETS_PER_USER)]
+    for i in range(LISTING_TRANSACTIONS):
+        sender = wallets[i % WALLETS_PER_USER]
+        receiver = wallets[(i + 1) % WALLETS_PER_USER]
+        transfer(client, headers, sender, receiver)
+    for _ in range(count):
+        yield partial(client.get, "/transactions/", headers=headers)
+
+
+def statistics_polling(client: TestClient, count: int) -> Iterator[Callable[[], Any]]:
+    headers = {"X-API-KEY": admin_api_key}
+    for _ in range(count):
+        yield partial(client.get, "/statistics/", headers=headers)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "signup_storm": signup_storm,
+    "wallet_creation": wallet_creation,
+    "transfer_loop": transfer_loop,
+    "listing": listing,
+    "statistics_polling": statistics_polling,
+}
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(percentiles[49], 4),
+        "p95_ms": round(percentiles[94], 4),
+        "p99_ms": round(percentiles[98], 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+    }
+
+
+def measure(scenario: Scenario, backend: str, count: int) -> Dict[str, float]:
+    with TestClient(setup(StubFeed(BTC_TO_USD), backend)) as client:
+        latencies = []
+        elapsed = 0.0
+        for request in scenario(client, count):
+            started = time.perf_counter()
+            request()
+            latency = time.perf_counter() - started
+            elapsed += latency
+            latencies.append(latency * 1000)
+    return summarize(latencies, elapsed)
+
+
+def run_scenario(name: str, backend: str, count: int) -> Dict[str, Any]:
+    if backend == MEMORY_BACKEND:
+        return measure(SCENARIOS[name], backend, count)
+
+    database = ConnectionManager.database
+    with tempfile.TemporaryDirectory() as directory:
+        ConnectionManager.set_database(str(Path(directory) / "bench.db"))
+        try:
+            return measure(SCENARIOS[name], backend, count)
+        finally:
+            ConnectionManager.set_database(database)
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    previous: Dict[Tuple[str, str], Dict[str, Any]] = {
+        (r["backend"], r["scenario"]): r for r in baseline
+    }
+    found = []
+    for result in results:
+        before = previous.get((result["backend"], result["scenario"]))
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if result[metric] > before[metric] * (1 + tolerance):
+                found.append(
+                    f"{result['backend']}/{result['scenario']} {metric}: "
+                    f"{before[metric]} -> {result[metric]}"
+                )
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            found.append(
+                f"{result['backend']}/{result['scenario']} throughput_rps: "
+                f"{before['throughput_rps']} -> {result['throughput_rps']}"
+            )
+    return found
+
+
+@cli.command()
+def run(
+    backends: List[str] = Option([SQLITE_BACKEND, MEMORY_BACKEND], "--backend"),
+    scenarios: List[str] = Option(list(SCENARIOS), "--scenario"),
+    requests: int = Option(500, min=2),
+    save: Optional[Path] = None,
+    baseline: Optional[Path] = None,
+    tolerance: float = 0.2,
+    durability: str = REQUEST_DURABILITY,
+) -> None:
+    ConnectionManager.configure(durability=durability)
+    results = []
+    for backend in backends:
+        for name in scenarios:
+            result = {
+                "backend": backend,
+                "scenario": name,
+                "requests": requests,
+                **run_scenario(name, backend, requests),
+            }
+            print(json.dumps(result))
+            results.append(result)
+
+    if save is not None:
+        save.write_text(json.dumps(results, indent=2))
+
+    if baseline is not None:
+        found = regressions(results, json.loads(baseline.read_text()), tolerance)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            raise Exit(code=1)
+
+
+if __name__ == "__main__":
+    cli()
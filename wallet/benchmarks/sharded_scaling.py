@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+from typing import List, Tuple
+from uuid import uuid4
+
+from typer import Option, Typer
+
+from wallet.core.entity.wallet import Wallet
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+
+WALLET_AMOUNT = 1_000_000
+TRANSFER_AMOUNT = 100
+
+cli = Typer(add_completion=False)
+
+
+def plan(addresses: List[str], count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    pairs = []
+    for _ in range(count):
+        from_address, to_address = rng.sample(addresses, 2)
+        pairs.append((from_address, to_address))
+    return pairs
+
+
+def measure(shards: int, transfers: int, wallets: int, seed: int) -> float:
+    ledger = ShardedLedger(shards)
+    ledger.start()
+    try:
+        addresses = [str(uuid4()) for _ in range(wallets)]
+        for address in addresses:
+            ledger.create_wallet(Wallet(address, WALLET_AMOUNT, uuid4()))
+        rng = random.Random(seed)
+        plans = [plan(addresses, transfers // shards, rng) for _ in range(shards)]
+
+        def transfer(pairs: List[Tuple[str, str]]) -> None:
+            for from_address, to_address in pairs:
+                ledger.transfer(
+                    from_address, to_address, TRANSFER_AMOUNT, TRANSFER_AMOUNT
+                )
+
+        threads = [threading.Thread(target=transfer, args=(p,)) for p in plans]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return sum(len(p) for p in plans) / elapsed
+    finally:
+        ledger.stop()
+
+
+@cli.command()
+def run(
+    max_shards: int = Option(os.cpu_count() or 1, min=1),
+    transfers: int = Option(20_000, min=1),
+    wallets: int = Option(1_000, min=2),
+    seed: int = 0,
+) -> None:
+    baseline = 0.0
+    for shards in range(1, max_shards + 1):
+        throughput = measure(shards, transfers, wallets, seed)
+        baseline = baseline or throughput
+        print(
+            json.dumps(
+                {
+                    "shards": shards,
+                    "threads": shards,
+                    "cores": os.cpu_count(),
+                    "cross_shard_ratio": round(1 - 1 / shards, 4),
+                    "transfers_per_second": round(throughput, 2),
+                    "speedup": round(throughput / baseline, 4),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    cli()
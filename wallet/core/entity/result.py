@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class BulkResult(Generic[T]):
+    item: T
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
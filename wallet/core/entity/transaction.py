@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Protocol
+from typing import List, Optional, Protocol
 from uuid import UUID, uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     from_address: str
     to_address: str
@@ -17,6 +17,12 @@ class Transaction:
         return hash(self.transaction_id)
 
 
+@dataclass
+class TransactionPage:
+    transactions: List[Transaction]
+    next_cursor: Optional[str] = None
+
+
 class ITransactionBuilder(Protocol):
     def builder(self) -> ITransactionBuilder:
         pass
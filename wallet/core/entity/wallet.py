@@ -5,7 +5,7 @@ from typing import Protocol
 from uuid import UUID, uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class Wallet:
     address: str
     amount: int
@@ -20,3 +20,11 @@ class WrongOwnerError(Exception):
 
 class NotEnoughBalanceError(Exception):
     pass
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class PersistenceError(Exception):
+    pass
@@ -1,26 +1,69 @@
+import asyncio
+from collections import defaultdict
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
-from typing import List
+from functools import partial
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    ParamSpec,
+    TypeVar,
+)
 from uuid import UUID
 
-from wallet.core.entity.transaction import Transaction
+from wallet.core.entity.result import BulkResult
+from wallet.core.entity.transaction import Transaction, TransactionPage
 from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
-from wallet.core.error.errors import NotEnoughBalanceError
-from wallet.core.tool.calculator import FeeCalculator
+from wallet.core.error.errors import DoesNotExistError, NotEnoughBalanceError
+from wallet.core.tool.cache import LRUCache
+from wallet.core.tool.calculator import (
+    DEFAULT_FEE_STRATEGY,
+    FeeCalculator,
+    calculate_named_fees,
+    get_fee_strategy,
+)
 from wallet.core.tool.generator import DefaultGenerator, IGenerator
 from wallet.core.tool.validator import DefaultValidator, IValidator
 from wallet.infra.repository.repository_interface import (
+    TRANSACTION_BATCH_SIZE,
     ITransactionRepository,
+    IUnitOfWork,
     IUserRepository,
     IWalletRepository,
 )
 
+IMPORT_CHUNK_SIZE = 1_000
+FEE_CHUNK_SIZE = 5_000
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+async def run_in_executor(
+    executor: Executor, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(function, *args, **kwargs))
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
 
 @dataclass
 class UserService:
     user_repository: IUserRepository
     generator: IGenerator = field(default_factory=DefaultGenerator)
     validator: IValidator = field(default_factory=DefaultValidator)
+    api_key_cache: LRUCache[str, User] = field(default_factory=LRUCache)
 
     def get_user_by_id(self, user_id: UUID) -> User:
         return self.user_repository.get_user_by_id(user_id)
@@ -29,13 +72,35 @@ class UserService:
         return self.user_repository.get_user_by_email(email)
 
     def get_user_by_api_key(self, api_key: str) -> User:
-        return self.user_repository.get_user_by_api_key(api_key)
+        user = self.api_key_cache.get(api_key)
+        if user is None:
+            user = self.user_repository.get_user_by_api_key(api_key)
+            self.api_key_cache.put(api_key, user)
+        return user
 
     def create_user(self, user: User) -> User:
         user.api_key = user.api_key or self.generator.generate_api_key()
         self.validator.validate_user(user)
         return self.user_repository.create_user(user)
 
+    def create_users(self, users: List[User]) -> List[BulkResult[User]]:
+        results = self.validator.validate_users(users)
+        valid = [result.item for result in results if result.succeeded]
+        missing = [user for user in valid if not user.api_key]
+        for user, api_key in zip(
+            missing, self.generator.generate_api_keys(len(missing))
+        ):
+            user.api_key = api_key
+
+        created = iter(self.user_repository.create_users(valid))
+        return [next(created) if result.succeeded else result for result in results]
+
+    def import_users(
+        self, users: Iterable[User], chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> Iterator[BulkResult[User]]:
+        for chunk in chunked(users, chunk_size):
+            yield from self.create_users(chunk)
+
     def get_api_key_by_id(self, user_id: UUID) -> str:
         return self.user_repository.get_api_key_by_id(user_id)
 
@@ -43,6 +108,7 @@ class UserService:
         return self.user_repository.get_api_key_by_email(email)
 
     def tear_down(self) -> None:
+        self.api_key_cache.clear()
         self.user_repository.tear_down()
 
 
@@ -50,50 +116,157 @@ class UserService:
 class TransactionService:
     transaction_repository: ITransactionRepository
     wallet_repository: IWalletRepository
+    unit_of_work: IUnitOfWork
     validator: IValidator = field(default_factory=DefaultValidator)
+    fee_strategy: str = DEFAULT_FEE_STRATEGY
+    fee_executor: Optional[Executor] = None
 
     def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
         return self.transaction_repository.get_transaction_by_id(transaction_id)
 
     def get_all_transactions(self) -> List[Transaction]:
-        return self.transaction_repository.get_all_transactions()
+        return list(self.iter_transactions())
+
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        return self.transaction_repository.iter_transactions(batch_size)
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self.transaction_repository.get_transactions_page(limit, cursor)
 
     def create_transaction(
         self, transaction: Transaction, sender: User, validate_sender: bool = True
     ) -> Transaction:
-        from_wallet = self.wallet_repository.get_wallet(transaction.from_address)
         if validate_sender:
+            from_wallet = self.wallet_repository.get_wallet(transaction.from_address)
             self.validator.validate_wallet_owner(from_wallet, sender)
-        to_wallet = self.wallet_repository.get_wallet(transaction.to_address)
 
-        fee = FeeCalculator.calculate_fee(transaction.amount)
+        transaction.fee = FeeCalculator.calculate_fee(
+            transaction.amount, get_fee_strategy(self.fee_strategy)
+        )
 
-        if from_wallet.amount < transaction.amount + fee:
-            raise NotEnoughBalanceError("Not enough balance in the wallet.")
+        with self.unit_of_work.atomic(
+            (transaction.from_address, transaction.to_address)
+        ):
+            self.wallet_repository.transfer(
+                transaction.from_address,
+                transaction.to_address,
+                transaction.amount,
+                transaction.amount + transaction.fee,
+            )
+            return self.transaction_repository.create_transaction(transaction)
 
-        transaction.fee = fee
-        tx = self.transaction_repository.create_transaction(transaction)
+    def create_transactions_bulk(
+        self,
+        transactions: List[Transaction],
+        sender: User,
+        validate_sender: bool = True,
+    ) -> List[BulkResult[Transaction]]:
+        fees = self._calculate_fees([t.amount for t in transactions])
+        for transaction, fee in zip(transactions, fees):
+            transaction.fee = fee
 
-        from_wallet_new_amount, to_wallet_new_amount = (
-            from_wallet.amount - transaction.amount,
-            to_wallet.amount + transaction.amount,
-        )
-        self.wallet_repository.update_amount(
-            from_wallet.address, from_wallet_new_amount
-        )
-        self.wallet_repository.update_amount(to_wallet.address, to_wallet_new_amount)
+        addresses = {t.from_address for t in transactions} | {
+            t.to_address for t in transactions
+        }
+        results: List[BulkResult[Transaction]] = []
+        with self.unit_of_work.atomic(addresses):
+            wallets = {
+                w.address: w for w in self.wallet_repository.get_wallets(addresses)
+            }
+            owner_errors = {
+                t.from_address: self._owner_error(wallets[t.from_address], sender)
+                for t in transactions
+                if validate_sender and t.from_address in wallets
+            }
+            balances = {address: w.amount for address, w in wallets.items()}
+            changes: Dict[str, int] = defaultdict(int)
+            for transaction in transactions:
+                error = self._transfer_error(transaction, balances, owner_errors)
+                results.append(BulkResult(transaction, error))
+                if error is None:
+                    for balance in (balances, changes):
+                        balance[transaction.from_address] -= transaction.amount
+                        balance[transaction.to_address] += transaction.amount
+
+            self.transaction_repository.create_transactions(
+                [result.item for result in results if result.succeeded]
+            )
+            self.wallet_repository.apply_balance_changes(changes)
+
+        return results
 
-        return tx
+    def _calculate_fees(self, amounts: List[int]) -> List[int]:
+        if self.fee_executor is None:
+            return calculate_named_fees(self.fee_strategy, amounts)
+
+        calculate = partial(calculate_named_fees, self.fee_strategy)
+        chunks = self.fee_executor.map(calculate, chunked(amounts, FEE_CHUNK_SIZE))
+        return [fee for fees in chunks for fee in fees]
+
+    def _owner_error(self, wallet: Wallet, sender: User) -> Optional[Exception]:
+        try:
+            self.validator.validate_wallet_owner(wallet, sender)
+        except Exception as err:
+            return err
+        return None
+
+    @staticmethod
+    def _transfer_error(
+        transaction: Transaction,
+        balances: Dict[str, int],
+        owner_errors: Dict[str, Optional[Exception]],
+    ) -> Optional[Exception]:
+        for address in (transaction.from_address, transaction.to_address):
+            if address not in balances:
+                return DoesNotExistError(f"Wallet with address {address} not found")
+
+        owner_error = owner_errors.get(transaction.from_address)
+        if owner_error is not None:
+            return owner_error
+
+        if balances[transaction.from_address] < transaction.amount + transaction.fee:
+            return NotEnoughBalanceError("Not enough balance in the wallet.")
+        return None
 
     def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
         return self.transaction_repository.filter_transactions(wallet)
 
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        return self.transaction_repository.get_user_transactions(user)
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self.transaction_repository.filter_transactions_page(
+            wallet, limit, cursor
+        )
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self.transaction_repository.get_user_transactions_page(
+            user, limit, cursor
+        )
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        return self.transaction_repository.iter_wallet_transactions(wallet)
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        return self.transaction_repository.iter_user_transactions(user)
+
     def get_transaction_count(self) -> int:
         return self.transaction_repository.get_transaction_count()
 
     def get_profit(self) -> int:
         return self.transaction_repository.get_profit()
 
+    def reconcile_statistics(self) -> None:
+        self.transaction_repository.reconcile_statistics()
+
     def tear_down(self) -> None:
         self.transaction_repository.tear_down()
         self.wallet_repository.tear_down()
@@ -125,3 +298,116 @@ class WalletService:
 
     def tear_down(self) -> None:
         self.wallet_repository.tear_down()
+
+
+@dataclass
+class AsyncUserService:
+    service: UserService
+    executor: Executor
+
+    async def get_user_by_api_key(self, api_key: str) -> User:
+        return await run_in_executor(
+            self.executor, self.service.get_user_by_api_key, api_key
+        )
+
+    async def create_user(self, user: User) -> User:
+        return await run_in_executor(self.executor, self.service.create_user, user)
+
+    async def create_users(self, users: List[User]) -> List[BulkResult[User]]:
+        return await run_in_executor(self.executor, self.service.create_users, users)
+
+    def import_users(
+        self, users: Iterable[User], chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> Iterator[BulkResult[User]]:
+        return self.service.import_users(users, chunk_size)
+
+
+@dataclass
+class AsyncTransactionService:
+    service: TransactionService
+    executor: Executor
+
+    async def create_transaction(
+        self, transaction: Transaction, sender: User, validate_sender: bool = True
+    ) -> Transaction:
+        return await run_in_executor(
+            self.executor,
+            self.service.create_transaction,
+            transaction,
+            sender,
+            validate_sender,
+        )
+
+    async def create_transactions_bulk(
+        self,
+        transactions: List[Transaction],
+        sender: User,
+        validate_sender: bool = True,
+    ) -> List[BulkResult[Transaction]]:
+        return await run_in_executor(
+            self.executor,
+            self.service.create_transactions_bulk,
+            transactions,
+            sender,
+            validate_sender,
+        )
+
+    async def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
+        return await run_in_executor(
+            self.executor, self.service.filter_transactions, wallet
+        )
+
+    async def get_user_transactions(self, user: User) -> List[Transaction]:
+        return await run_in_executor(
+            self.executor, self.service.get_user_transactions, user
+        )
+
+    async def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return await run_in_executor(
+            self.executor, self.service.filter_transactions_page, wallet, limit, cursor
+        )
+
+    async def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return await run_in_executor(
+            self.executor, self.service.get_user_transactions_page, user, limit, cursor
+        )
+
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        return self.service.iter_transactions(batch_size)
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        return self.service.iter_wallet_transactions(wallet)
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        return self.service.iter_user_transactions(user)
+
+    async def get_transaction_count(self) -> int:
+        return await run_in_executor(self.executor, self.service.get_transaction_count)
+
+    async def get_profit(self) -> int:
+        return await run_in_executor(self.executor, self.service.get_profit)
+
+
+@dataclass
+class AsyncWalletService:
+    service: WalletService
+    executor: Executor
+
+    async def create_wallet(self, wallet: Wallet) -> Wallet:
+        return await run_in_executor(self.executor, self.service.create_wallet, wallet)
+
+    async def get_wallet(
+        self, address: str, user: User, validate_owner: bool = True
+    ) -> Wallet:
+        return await run_in_executor(
+            self.executor, self.service.get_wallet, address, user, validate_owner
+        )
+
+    async def get_user_wallets(self, user: User) -> List[Wallet]:
+        return await run_in_executor(self.executor, self.service.get_user_wallets, user)
@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_CACHE_TTL = 300.0
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.clock() - entry[1] > self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        with self.lock:
+            self.entries[key] = (value, self.clock())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
@@ -1,4 +1,12 @@
-from typing import Callable, Protocol
+from array import array
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Protocol, Sequence, cast
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment, unused-ignore]
 
 fee_percentage = 0.015
 
@@ -7,6 +15,63 @@ def default_fee_calculating_strategy(amount: int) -> int:
     return max(int(amount * fee_percentage), 1)
 
 
+def default_vectorized_fee_calculating_strategy(amounts: Any) -> Any:
+    return numpy.maximum((amounts * fee_percentage).astype(numpy.int64), 1)
+
+
+DEFAULT_FEE_STRATEGY = "default"
+FEE_STRATEGIES: Dict[str, Callable[[int], int]] = {
+    DEFAULT_FEE_STRATEGY: default_fee_calculating_strategy
+}
+VECTORIZED_FEE_STRATEGIES: Dict[Callable[[int], int], Callable[[Any], Any]] = {
+    default_fee_calculating_strategy: default_vectorized_fee_calculating_strategy
+}
+
+
+def register_fee_strategy(name: str, strategy: Callable[[int], int]) -> None:
+    FEE_STRATEGIES[name] = strategy
+
+
+def register_vectorized_fee_strategy(
+    strategy: Callable[[int], int], vectorized: Callable[[Any], Any]
+) -> None:
+    VECTORIZED_FEE_STRATEGIES[strategy] = vectorized
+
+
+@lru_cache(maxsize=None)
+def percentage_fee_calculating_strategy(percentage: float) -> Callable[[int], int]:
+    def strategy(amount: int) -> int:
+        return max(int(amount * percentage), 1)
+
+    def vectorized(amounts: Any) -> Any:
+        return numpy.maximum((amounts * percentage).astype(numpy.int64), 1)
+
+    register_vectorized_fee_strategy(strategy, vectorized)
+    return strategy
+
+
+def get_fee_strategy(name: str) -> Callable[[int], int]:
+    try:
+        return FEE_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown fee strategy {name}")
+
+
+def load_fee_strategy(name: str) -> Callable[[int], int]:
+    if name not in FEE_STRATEGIES and ":" in name:
+        module_name, attribute = name.split(":", 1)
+        try:
+            strategy = getattr(import_module(module_name), attribute)
+        except (ImportError, AttributeError) as err:
+            raise ValueError(f"Cannot load fee strategy {name}") from err
+        register_fee_strategy(name, strategy)
+    return get_fee_strategy(name)
+
+
+def calculate_named_fees(strategy: str, amounts: List[int]) -> List[int]:
+    return list(FeeCalculator.calculate_fees(amounts, get_fee_strategy(strategy)))
+
+
 class IFeeCalculator(Protocol):
     @staticmethod
     def calculate_fee(
@@ -14,6 +79,12 @@ class IFeeCalculator(Protocol):
     ) -> int:
         pass
 
+    @staticmethod
+    def calculate_fees(
+        amounts: Sequence[int], fee_calculating_strategy: Callable[[int], int]
+    ) -> Sequence[int]:
+        pass
+
 
 class FeeCalculator(IFeeCalculator):
     @staticmethod
@@ -24,3 +95,19 @@ class FeeCalculator(IFeeCalculator):
         ] = default_fee_calculating_strategy,
     ) -> int:
         return fee_calculating_strategy(amount)
+
+    @staticmethod
+    def calculate_fees(
+        amounts: Sequence[int],
+        fee_calculating_strategy: Callable[
+            [int], int
+        ] = default_fee_calculating_strategy,
+    ) -> Sequence[int]:
+        vectorized = VECTORIZED_FEE_STRATEGIES.get(fee_calculating_strategy)
+        if numpy is not None and vectorized is not None:
+            fees = vectorized(numpy.asarray(amounts, dtype=numpy.int64))
+            if isinstance(amounts, numpy.ndarray):
+                return cast(Sequence[int], fees)
+            return array("q", fees.tobytes())
+
+        return array("q", map(fee_calculating_strategy, amounts))
@@ -1,20 +1,17 @@
+from dataclasses import dataclass
 from typing import Protocol
 
-import requests
-
-from wallet.core.error.errors import ConversionError
+from wallet.core.tool.rate_provider import IRateProvider
 
 BTC_TO_SATOSHI = 100_000_000
 DEFAULT_WALLET_BALANCE = BTC_TO_SATOSHI
 
 
 class IConverter(Protocol):
-    @staticmethod
-    def btc_to_usd(value: float) -> float:
+    def btc_to_usd(self, value: float) -> float:
         pass
 
-    @staticmethod
-    def satoshi_to_usd(value: int) -> float:
+    def satoshi_to_usd(self, value: int) -> float:
         pass
 
     @staticmethod
@@ -26,18 +23,15 @@ class IConverter(Protocol):
         pass
 
 
+@dataclass
 class Converter(IConverter):
-    @staticmethod
-    def btc_to_usd(value: float, url: str = "https://blockchain.info") -> float:
-        response: requests.Response = requests.get(f"{url}/ticker")
-        if response.status_code == 200:
-            return value * float(response.json()["USD"]["last"])
+    rate_provider: IRateProvider
 
-        raise ConversionError("Error when trying to convert BTC to USD")
+    def btc_to_usd(self, value: float) -> float:
+        return value * self.rate_provider.get_btc_to_usd()
 
-    @staticmethod
-    def satoshi_to_usd(value: int) -> float:
-        return Converter.btc_to_usd(Converter.satoshi_to_btc(value))
+    def satoshi_to_usd(self, value: int) -> float:
+        return self.btc_to_usd(Converter.satoshi_to_btc(value))
 
     @staticmethod
     def btc_to_satoshi(value: float) -> int:
@@ -1,11 +1,14 @@
 import uuid
-from typing import Protocol
+from typing import List, Protocol
 
 
 class IGenerator(Protocol):
     def generate_api_key(self) -> str:
         pass
 
+    def generate_api_keys(self, count: int) -> List[str]:
+        pass
+
     def generate_wallet_address(self) -> str:
         pass
 
@@ -14,5 +17,8 @@ class DefaultGenerator(IGenerator):
     def generate_api_key(self) -> str:
         return str(uuid.uuid4())
 
+    def generate_api_keys(self, count: int) -> List[str]:
+        return [str(uuid.uuid4()) for _ in range(count)]
+
     def generate_wallet_address(self) -> str:
         return str(uuid.uuid4())
@@ -0,0 +1,122 @@
+import threading
+import time
+from typing import Callable, Optional, Protocol
+
+import requests
+
+from wallet.core.error.errors import ConversionError
+
+DEFAULT_TICKER_URL = "https://blockchain.info"
+DEFAULT_TICKER_TIMEOUT = 5.0
+DEFAULT_RATE_TTL = 60.0
+DEFAULT_MAX_STALENESS = 15 * 60.0
+DEFAULT_MIN_REFRESH_INTERVAL = 5.0
+
+
+class IRateFeed(Protocol):
+    def fetch_btc_to_usd(self) -> float:
+        pass
+
+
+class BlockchainInfoFeed(IRateFeed):
+    def __init__(
+        self, url: str = DEFAULT_TICKER_URL, timeout: float = DEFAULT_TICKER_TIMEOUT
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def fetch_btc_to_usd(self) -> float:
+        response: requests.Response = requests.get(
+            f"{self.url}/ticker", timeout=self.timeout
+        )
+        if response.status_code == 200:
+            return float(response.json()["USD"]["last"])
+
+        raise ConversionError("Error when trying to convert BTC to USD")
+
+
+class StubFeed(IRateFeed):
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+
+    def fetch_btc_to_usd(self) -> float:
+        return self.rate
+
+
+class IRateProvider(Protocol):
+    def get_btc_to_usd(self) -> float:
+        pass
+
+
+class CachedRateProvider(IRateProvider):
+    def __init__(
+        self,
+        feed: IRateFeed,
+        ttl: float = DEFAULT_RATE_TTL,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.feed = feed
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self.rate: Optional[float] = None
+        self.fetched_at: float = 0.0
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def get_btc_to_usd(self) -> float:
+        with self.lock:
+            rate, fetched_at = self.rate, self.fetched_at
+
+        if rate is None:
+            self.wake.set()
+            raise ConversionError("BTC to USD rate is not available yet")
+
+        age = self.clock() - fetched_at
+        if age > self.ttl:
+            self.wake.set()
+        if age > self.max_staleness:
+            raise ConversionError("BTC to USD rate is too stale")
+
+        return rate
+
+    def refresh(self) -> bool:
+        try:
+            rate = self.feed.fetch_btc_to_usd()
+        except Exception:
+            return False
+
+        with self.lock:
+            self.rate, self.fetched_at = rate, self.clock()
+        return True
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self._run, name="rate-refresher", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is None:
+            return
+
+        self.stopped.set()
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+
+    def _run(self) -> None:
+        while not self.stopped.is_set():
+            self.refresh()
+            self.stopped.wait(self.min_refresh_interval)
+            self.wake.wait(self.ttl)
+            self.wake.clear()
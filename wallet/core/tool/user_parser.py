@@ -0,0 +1,40 @@
+import csv
+import json
+from typing import Callable, Dict, Iterable, Iterator, Protocol
+
+from wallet.core.entity.user import User, UserBuilder
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+
+
+class IUserParser(Protocol):
+    def parse(self, lines: Iterable[str]) -> Iterator[User]:
+        pass
+
+
+class CSVUserParser(IUserParser):
+    def parse(self, lines: Iterable[str]) -> Iterator[User]:
+        rows = (row for row in csv.reader(lines) if any(cell.strip() for cell in row))
+        header = [column.strip().lower() for column in next(rows, [])]
+        for row in rows:
+            email = dict(zip(header, row)).get("email", "")
+            yield UserBuilder().builder().email(email.strip()).build()
+
+
+class NDJSONUserParser(IUserParser):
+    def parse(self, lines: Iterable[str]) -> Iterator[User]:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                email = str(json.loads(line).get("email", ""))
+            except (ValueError, AttributeError):
+                email = line.strip()
+            yield UserBuilder().builder().email(email).build()
+
+
+USER_PARSERS: Dict[str, Callable[[], IUserParser]] = {
+    CSV_FORMAT: CSVUserParser,
+    NDJSON_FORMAT: NDJSONUserParser,
+}
@@ -1,16 +1,24 @@
-from re import compile
-from typing import Protocol
+from functools import lru_cache
+from re import Pattern, compile
+from typing import Iterable, List, Protocol
 
+from wallet.core.entity.result import BulkResult
 from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
 from wallet.core.error.errors import WrongEmailError, WrongOwnerError
 
+EMAIL_CACHE_SIZE = 4_096
+
 
 class IValidator(Protocol):
     @staticmethod
     def validate_user(user: User) -> None:
         pass
 
+    @staticmethod
+    def validate_users(users: Iterable[User]) -> List[BulkResult[User]]:
+        pass
+
     @staticmethod
     def validate_wallet(wallet: Wallet) -> None:
         pass
@@ -22,6 +30,7 @@ class IValidator(Protocol):
 
 class DefaultValidator(IValidator):
     EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    EMAIL_PATTERN: Pattern[str] = compile(EMAIL_REGEX)
 
     @staticmethod
     def validate_user(user: User) -> None:
@@ -29,11 +38,20 @@ class DefaultValidator(IValidator):
             raise WrongEmailError(f"Wrong email: {user.email}")
 
     @staticmethod
-    def is_valid_email(email: str) -> bool:
-        email_pattern = compile(DefaultValidator.EMAIL_REGEX)
-        match = email_pattern.match(email)
+    def validate_users(users: Iterable[User]) -> List[BulkResult[User]]:
+        results = []
+        for user in users:
+            try:
+                DefaultValidator.validate_user(user)
+                results.append(BulkResult(user))
+            except WrongEmailError as err:
+                results.append(BulkResult(user, err))
+        return results
 
-        return bool(match)
+    @staticmethod
+    @lru_cache(maxsize=EMAIL_CACHE_SIZE)
+    def is_valid_email(email: str) -> bool:
+        return DefaultValidator.EMAIL_PATTERN.match(email) is not None
 
     @staticmethod
     def validate_wallet_owner(wallet: Wallet, user: User) -> None:
@@ -3,23 +3,40 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.requests import Request
 
-from wallet.core.facade import TransactionService, UserService, WalletService
+from wallet.core.entity.user import User
+from wallet.core.facade import (
+    AsyncTransactionService,
+    AsyncUserService,
+    AsyncWalletService,
+)
+from wallet.core.tool.cache import LRUCache
+from wallet.core.tool.converter import IConverter
 
 
-def get_user_service(request: Request) -> UserService:
+def get_user_service(request: Request) -> AsyncUserService:
     return request.app.state.user_service  # type: ignore
 
 
-def get_wallet_service(request: Request) -> WalletService:
+def get_wallet_service(request: Request) -> AsyncWalletService:
     return request.app.state.wallet_service  # type: ignore
 
 
-def get_transaction_service(request: Request) -> TransactionService:
+def get_transaction_service(request: Request) -> AsyncTransactionService:
     return request.app.state.transaction_service  # type: ignore
 
 
-UserServiceDependable = Annotated[UserService, Depends(get_user_service)]
-WalletServiceDependable = Annotated[WalletService, Depends(get_wallet_service)]
+def get_converter(request: Request) -> IConverter:
+    return request.app.state.converter  # type: ignore
+
+
+def get_api_key_cache(request: Request) -> LRUCache[str, User]:
+    return request.app.state.api_key_cache  # type: ignore
+
+
+UserServiceDependable = Annotated[AsyncUserService, Depends(get_user_service)]
+WalletServiceDependable = Annotated[AsyncWalletService, Depends(get_wallet_service)]
 TransactionServiceDependable = Annotated[
-    TransactionService, Depends(get_transaction_service)
+    AsyncTransactionService, Depends(get_transaction_service)
 ]
+ConverterDependable = Annotated[IConverter, Depends(get_converter)]
+ApiKeyCacheDependable = Annotated[LRUCache[str, User], Depends(get_api_key_cache)]
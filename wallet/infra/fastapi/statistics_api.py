@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Header
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
-from wallet.infra.fastapi.dependables import TransactionServiceDependable
+from wallet.infra.fastapi.dependables import (
+    ApiKeyCacheDependable,
+    TransactionServiceDependable,
+)
+from wallet.infra.fastapi.transactions_api import ndjson_response
 
 statistics_api = APIRouter()
 
@@ -12,15 +16,33 @@ admin_api_key: str = "f215d09f570b2799c8adb1eb97df6d67ac2578ca7eee2ad200e336958b
 class StatisticsResponse(BaseModel):
     transaction_count: int
     profit: int
+    api_key_cache_hits: int
+    api_key_cache_misses: int
 
 
 @statistics_api.get("/", status_code=201, response_model=StatisticsResponse)
-def list_transactions(
+async def list_transactions(
     transaction_service: TransactionServiceDependable,
+    api_key_cache: ApiKeyCacheDependable,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
 ) -> dict[str, int] | JSONResponse:
     if api_key != admin_api_key:
         return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
-    transaction_count: int = transaction_service.get_transaction_count()
-    profit: int = transaction_service.get_profit()
-    return {"transaction_count": transaction_count, "profit": profit}
+    transaction_count: int = await transaction_service.get_transaction_count()
+    profit: int = await transaction_service.get_profit()
+    return {
+        "transaction_count": transaction_count,
+        "profit": profit,
+        "api_key_cache_hits": api_key_cache.hits,
+        "api_key_cache_misses": api_key_cache.misses,
+    }
+
+
+@statistics_api.get("/transactions", status_code=201, response_model=None)
+async def export_transactions(
+    transaction_service: TransactionServiceDependable,
+    api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
+) -> Response:
+    if api_key != admin_api_key:
+        return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+    return ndjson_response(transaction_service.iter_transactions())
@@ -1,14 +1,14 @@
-from typing import Any
+import json
+from typing import Any, Iterator, Optional
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Query
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
-from wallet.core.entity.transaction import TransactionBuilder
+from wallet.core.entity.transaction import Transaction, TransactionBuilder
 from wallet.infra.fastapi.dependables import (
     TransactionServiceDependable,
     UserServiceDependable,
-    WalletServiceDependable,
 )
 
 transactions_api = APIRouter()
@@ -24,6 +24,7 @@ class TransactionResponse(BaseModel):
 
 class TransactionListResponse(BaseModel):
     transaction_list: list[TransactionResponse]
+    next_cursor: Optional[str] = None
 
 
 class MakeTransactionRequest(BaseModel):
@@ -32,34 +33,63 @@ class MakeTransactionRequest(BaseModel):
     amount: int
 
 
+class MakeTransactionsRequest(BaseModel):
+    transactions: list[MakeTransactionRequest]
+
+
+class TransactionResultResponse(BaseModel):
+    id: str
+    success: bool
+    error: Optional[str] = None
+
+
+class TransactionResultListResponse(BaseModel):
+    results: list[TransactionResultResponse]
+
+
+def transaction_to_dict(transaction: Transaction) -> dict[str, Any]:
+    return {
+        "id": str(transaction.transaction_id),
+        "from_address": transaction.from_address,
+        "to_address": transaction.to_address,
+        "amount": transaction.amount,
+        "fee": transaction.fee,
+    }
+
+
+def ndjson_response(transactions: Iterator[Transaction]) -> StreamingResponse:
+    return StreamingResponse(
+        (json.dumps(transaction_to_dict(t)) + "\n" for t in transactions),
+        media_type="application/x-ndjson",
+    )
+
+
 @transactions_api.get("/", status_code=201, response_model=TransactionListResponse)
-def list_transactions(
+async def list_transactions(
     user_service: UserServiceDependable,
-    wallet_service: WalletServiceDependable,
     transaction_service: TransactionServiceDependable,
+    limit: Optional[int] = Query(None, gt=0),
+    cursor: Optional[str] = None,
+    stream: bool = False,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
-) -> dict[str, list[dict[str, Any]]] | JSONResponse:
+) -> dict[str, Any] | Response:
     try:
-        user = user_service.get_user_by_api_key(api_key)
-        wallets = wallet_service.get_user_wallets(user)
-        transactions = [
-            transaction
-            for wallet in wallets
-            for transaction in transaction_service.filter_transactions(wallet)
-        ]
+        user = await user_service.get_user_by_api_key(api_key)
+        if stream:
+            return ndjson_response(transaction_service.iter_user_transactions(user))
 
-        response = [
-            {
-                "id": str(t.transaction_id),
-                "from_address": t.from_address,
-                "to_address": t.to_address,
-                "amount": t.amount,
-                "fee": t.fee,
-            }
-            for t in set(transactions)
-        ]
+        if limit is None:
+            transactions = await transaction_service.get_user_transactions(user)
+            next_cursor = None
+        else:
+            page = await transaction_service.get_user_transactions_page(
+                user, limit, cursor
+            )
+            transactions, next_cursor = page.transactions, page.next_cursor
+
+        response = [transaction_to_dict(t) for t in transactions]
 
-        return {"transaction_list": response}
+        return {"transaction_list": response, "next_cursor": next_cursor}
     except Exception as err:
         return JSONResponse(
             status_code=409,
@@ -68,14 +98,14 @@ def list_transactions(
 
 
 @transactions_api.post("/", status_code=201, response_model=None)
-def make_transaction(
+async def make_transaction(
     make_transaction_request: MakeTransactionRequest,
     user_service: UserServiceDependable,
     transaction_service: TransactionServiceDependable,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
 ) -> None | JSONResponse:
     try:
-        issuer = user_service.get_user_by_api_key(api_key)
+        issuer = await user_service.get_user_by_api_key(api_key)
         transaction = (
             TransactionBuilder()
             .builder()
@@ -84,10 +114,49 @@ def make_transaction(
             .amount(make_transaction_request.amount)
             .build()
         )
-        transaction_service.create_transaction(transaction, issuer)
+        await transaction_service.create_transaction(transaction, issuer)
         return None
     except Exception as err:
         return JSONResponse(
             status_code=409,
             content={"error": {"message": err.args}},
         )
+
+
+@transactions_api.post(
+    "/batch", status_code=201, response_model=TransactionResultListResponse
+)
+async def make_transactions(
+    make_transactions_request: MakeTransactionsRequest,
+    user_service: UserServiceDependable,
+    transaction_service: TransactionServiceDependable,
+    api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
+) -> dict[str, Any] | JSONResponse:
+    try:
+        issuer = await user_service.get_user_by_api_key(api_key)
+        transactions = [
+            TransactionBuilder()
+            .builder()
+            .from_address(request.sender_wallet_address)
+            .to_address(request.receiver_wallet_address)
+            .amount(request.amount)
+            .build()
+            for request in make_transactions_request.transactions
+        ]
+        results = await transaction_service.create_transactions_bulk(
+            transactions, issuer
+        )
+        response = [
+            {
+                "id": str(result.item.transaction_id),
+                "success": result.succeeded,
+                "error": None if result.error is None else str(result.error),
+            }
+            for result in results
+        ]
+        return {"results": response}
+    except Exception as err:
+        return JSONResponse(
+            status_code=409,
+            content={"error": {"message": err.args}},
+        )
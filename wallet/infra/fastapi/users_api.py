@@ -1,11 +1,21 @@
-from typing import Dict
+import json
+from io import TextIOWrapper
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, AsyncIterator, Dict, Iterator
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Query
+from fastapi.requests import Request
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
-from wallet.core.entity.user import UserBuilder
+from wallet.core.entity.result import BulkResult
+from wallet.core.entity.user import User, UserBuilder
+from wallet.core.facade import AsyncUserService
+from wallet.core.tool.user_parser import NDJSON_FORMAT, USER_PARSERS, IUserParser
 from wallet.infra.fastapi.dependables import UserServiceDependable
+from wallet.infra.fastapi.statistics_api import admin_api_key
+
+IMPORT_SPOOL_SIZE = 1024 * 1024
 
 users_api = APIRouter()
 
@@ -18,15 +28,63 @@ class CreateUserRequest(BaseModel):
     email: str
 
 
+def user_result_to_dict(result: BulkResult[User]) -> dict[str, Any]:
+    return {
+        "email": result.item.email,
+        "api_key": result.item.api_key if result.succeeded else None,
+        "success": result.succeeded,
+        "error": None if result.error is None else str(result.error),
+    }
+
+
+async def spool(chunks: AsyncIterator[bytes]) -> IO[bytes]:
+    body = SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE)
+    async for chunk in chunks:
+        body.write(chunk)
+    body.seek(0)
+    return body
+
+
+def import_results(
+    service: AsyncUserService, parser: IUserParser, body: IO[bytes]
+) -> Iterator[str]:
+    with TextIOWrapper(body, encoding="utf-8", errors="replace", newline="") as lines:
+        for result in service.import_users(parser.parse(lines)):
+            yield json.dumps(user_result_to_dict(result)) + "\n"
+
+
 @users_api.post("/", status_code=201, response_model=APIResponse)
-def create_user(
+async def create_user(
     create_request: CreateUserRequest, service: UserServiceDependable
 ) -> Dict[str, str] | JSONResponse:
     user = UserBuilder().builder().email(create_request.email).build()
     try:
-        return {"api_key": service.create_user(user).api_key}
+        return {"api_key": (await service.create_user(user)).api_key}
     except Exception as err:
         return JSONResponse(
             status_code=409,
             content={"error": {"message": err.args}},
         )
+
+
+@users_api.post("/bulk", status_code=201, response_model=None)
+async def import_users(
+    request: Request,
+    service: UserServiceDependable,
+    file_format: str = Query(NDJSON_FORMAT, alias="format"),
+    api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
+) -> Response:
+    if api_key != admin_api_key:
+        return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+    if file_format not in USER_PARSERS:
+        return JSONResponse(
+            status_code=409,
+            content={"error": {"message": [f"Unknown format {file_format}"]}},
+        )
+
+    body = await spool(request.stream())
+    return StreamingResponse(
+        import_results(service, USER_PARSERS[file_format](), body),
+        status_code=201,
+        media_type="application/x-ndjson",
+    )
@@ -1,16 +1,18 @@
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Query
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from wallet.core.entity.wallet import WalletBuilder
-from wallet.core.tool.converter import DEFAULT_WALLET_BALANCE, Converter
+from wallet.core.tool.converter import DEFAULT_WALLET_BALANCE
 from wallet.infra.fastapi.dependables import (
+    ConverterDependable,
     TransactionServiceDependable,
     UserServiceDependable,
     WalletServiceDependable,
 )
+from wallet.infra.fastapi.transactions_api import ndjson_response, transaction_to_dict
 
 wallet_api = APIRouter()
 
@@ -31,16 +33,18 @@ class WalletTransactionResponse(BaseModel):
 
 class WalletTransactionsResponse(BaseModel):
     transactions: list[WalletTransactionResponse]
+    next_cursor: Optional[str] = None
 
 
 @wallet_api.post(path="/", status_code=201, response_model=WalletResponse)
-def create_wallet(
+async def create_wallet(
     wallet_service: WalletServiceDependable,
     user_service: UserServiceDependable,
+    converter: ConverterDependable,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
 ) -> dict[str, Any] | JSONResponse:
     try:
-        user = user_service.get_user_by_api_key(api_key)
+        user = await user_service.get_user_by_api_key(api_key)
         wallet = (
             WalletBuilder()
             .builder()
@@ -48,10 +52,10 @@ def create_wallet(
             .amount(DEFAULT_WALLET_BALANCE)
             .build()
         )
-        wallet = wallet_service.create_wallet(wallet)
+        wallet = await wallet_service.create_wallet(wallet)
 
-        amount_btc = Converter.satoshi_to_btc(wallet.amount)
-        amount_usd = Converter.btc_to_usd(amount_btc)
+        amount_btc = converter.satoshi_to_btc(wallet.amount)
+        amount_usd = converter.btc_to_usd(amount_btc)
 
         return {
             "address": wallet.address,
@@ -66,17 +70,18 @@ def create_wallet(
 
 
 @wallet_api.get(path="/{address}", status_code=200, response_model=WalletResponse)
-def get_wallet(
+async def get_wallet(
     address: str,
     wallet_service: WalletServiceDependable,
     user_service: UserServiceDependable,
+    converter: ConverterDependable,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
 ) -> dict[str, Any] | JSONResponse:
     try:
-        user = user_service.get_user_by_api_key(api_key)
-        wallet = wallet_service.get_wallet(address, user)
-        amount_btc = Converter.satoshi_to_btc(wallet.amount)
-        amount_usd = Converter.btc_to_usd(amount_btc)
+        user = await user_service.get_user_by_api_key(api_key)
+        wallet = await wallet_service.get_wallet(address, user)
+        amount_btc = converter.satoshi_to_btc(wallet.amount)
+        amount_usd = converter.btc_to_usd(amount_btc)
 
         return {
             "address": wallet.address,
@@ -95,28 +100,33 @@ def get_wallet(
     status_code=200,
     response_model=WalletTransactionsResponse,
 )
-def get_wallet_transactions(
+async def get_wallet_transactions(
     address: str,
     user_service: UserServiceDependable,
     wallet_service: WalletServiceDependable,
     transaction_service: TransactionServiceDependable,
+    limit: Optional[int] = Query(None, gt=0),
+    cursor: Optional[str] = None,
+    stream: bool = False,
     api_key: str = Header(..., convert_underscores=False, alias="X-API-KEY"),
-) -> dict[str, Any] | JSONResponse:
+) -> dict[str, Any] | Response:
     try:
-        user = user_service.get_user_by_api_key(api_key)
-        wallet = wallet_service.get_wallet(address, user)
-        transactions = transaction_service.filter_transactions(wallet)
-        response = [
-            {
-                "id": str(t.transaction_id),
-                "from_address": t.from_address,
-                "to_address": t.to_address,
-                "amount": t.amount,
-                "fee": t.fee,
-            }
-            for t in set(transactions)
-        ]
-        return {"transactions": response}
+        user = await user_service.get_user_by_api_key(api_key)
+        wallet = await wallet_service.get_wallet(address, user)
+        if stream:
+            return ndjson_response(transaction_service.iter_wallet_transactions(wallet))
+
+        if limit is None:
+            transactions = await transaction_service.filter_transactions(wallet)
+            next_cursor = None
+        else:
+            page = await transaction_service.filter_transactions_page(
+                wallet, limit, cursor
+            )
+            transactions, next_cursor = page.transactions, page.next_cursor
+
+        response = [transaction_to_dict(t) for t in transactions]
+        return {"transactions": response, "next_cursor": next_cursor}
     except Exception as err:
         return JSONResponse(
             status_code=409,
@@ -0,0 +1,23 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error
+from typing import Optional
+
+from wallet.core.error.errors import InvalidCursorError
+
+
+def encode_cursor(position: int) -> str:
+    return urlsafe_b64encode(str(position).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if cursor is None:
+        return 0
+
+    try:
+        position = int(urlsafe_b64decode(cursor.encode()).decode())
+    except (Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+    if position < 0:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return position
@@ -0,0 +1,20 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Iterable, Iterator, List
+
+DEFAULT_STRIPES = 64
+
+
+class StripedLock:
+    def __init__(self, stripes: int = DEFAULT_STRIPES) -> None:
+        self.locks = [threading.RLock() for _ in range(stripes)]
+
+    def stripes(self, keys: Iterable[str]) -> List[int]:
+        return sorted({hash(key) % len(self.locks) for key in keys})
+
+    @contextmanager
+    def hold(self, keys: Iterable[str]) -> Iterator[None]:
+        with ExitStack() as stack:
+            for stripe in self.stripes(keys):
+                stack.enter_context(self.locks[stripe])
+            yield
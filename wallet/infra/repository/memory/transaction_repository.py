@@ -1,15 +1,32 @@
-from typing import Dict, List
+import threading
+from bisect import bisect_right
+from heapq import merge
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 from uuid import UUID
 
-from wallet.core.entity.transaction import Transaction
+from wallet.core.entity.transaction import Transaction, TransactionPage
+from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
 from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
-from wallet.infra.repository.repository_interface import ITransactionRepository
+from wallet.infra.repository.cursor import decode_cursor, encode_cursor
+from wallet.infra.repository.repository_interface import (
+    TRANSACTION_BATCH_SIZE,
+    ITransactionRepository,
+    IWalletRepository,
+)
 
 
 class TransactionRepository(ITransactionRepository):
-    def __init__(self) -> None:
+    def __init__(self, wallet_repository: IWalletRepository) -> None:
+        self.wallet_repository = wallet_repository
         self.transactions: Dict[UUID, Transaction] = {}
+        self.positions: Dict[UUID, int] = {}
+        self.ordered: List[Transaction] = []
+        self.address_index: Dict[str, List[Transaction]] = {}
+        self.transaction_count = 0
+        self.profit = 0
+        self.lock = threading.RLock()
 
     def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
         try:
@@ -19,30 +36,118 @@ class TransactionRepository(ITransactionRepository):
                 f"Transaction with id {str(transaction_id)} not found"
             )
 
-    def get_all_transactions(self) -> List[Transaction]:
-        return [v for v in self.transactions.values()]
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        transactions = self.ordered
+        return (transactions[i] for i in range(len(transactions)))
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        position = decode_cursor(cursor)
+        return self._page(
+            (self.ordered[i] for i in range(position, len(self.ordered))), limit
+        )
 
     def create_transaction(self, transaction: Transaction) -> Transaction:
-        if transaction.transaction_id in self.transactions:
-            raise AlreadyExistsError(
-                f"Transaction with id {str(transaction.transaction_id)} already exists"
-            )
+        with self.lock:
+            if transaction.transaction_id in self.transactions:
+                raise AlreadyExistsError(
+                    f"Transaction with id {str(transaction.transaction_id)} "
+                    "already exists"
+                )
+
+            self.transactions[transaction.transaction_id] = transaction
+            self.positions[transaction.transaction_id] = len(self.positions) + 1
+            self.ordered.append(transaction)
+            for address in {transaction.from_address, transaction.to_address}:
+                self.address_index.setdefault(address, []).append(transaction)
+            self.transaction_count += 1
+            self.profit += transaction.fee
+            return transaction
+
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        with self.lock:
+            if any(t.transaction_id in self.transactions for t in transactions):
+                raise AlreadyExistsError("Some of the transactions already exist")
 
-        self.transactions[transaction.transaction_id] = transaction
-        return transaction
+            for transaction in transactions:
+                self.create_transaction(transaction)
 
     def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
-        return [
-            v
-            for v in self.transactions.values()
-            if wallet.address in (v.from_address, v.to_address)
-        ]
+        return list(self.address_index.get(wallet.address, []))
+
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        return list(self._user_transactions_after(user, 0))
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(
+            self._wallet_transactions_after(wallet.address, decode_cursor(cursor)),
+            limit,
+        )
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(
+            self._user_transactions_after(user, decode_cursor(cursor)), limit
+        )
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        return self._wallet_transactions_after(wallet.address, 0)
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        return self._user_transactions_after(user, 0)
 
     def get_transaction_count(self) -> int:
-        return len(self.transactions)
+        return self.transaction_count
 
     def get_profit(self) -> int:
-        return sum(v.fee for v in self.transactions.values())
+        return self.profit
+
+    def reconcile_statistics(self) -> None:
+        with self.lock:
+            self.transaction_count = len(self.transactions)
+            self.profit = sum(v.fee for v in self.transactions.values())
 
     def tear_down(self) -> None:
         self.transactions = {}
+        self.positions = {}
+        self.ordered = []
+        self.address_index = {}
+        self.transaction_count = 0
+        self.profit = 0
+
+    def _position(self, transaction: Transaction) -> int:
+        return self.positions[transaction.transaction_id]
+
+    def _wallet_transactions_after(
+        self, address: str, position: int
+    ) -> Iterator[Transaction]:
+        transactions = self.address_index.get(address, [])
+        start = bisect_right(transactions, position, key=self._position)
+        return (transactions[i] for i in range(start, len(transactions)))
+
+    def _user_transactions_after(
+        self, user: User, position: int
+    ) -> Iterator[Transaction]:
+        last = position
+        for transaction in merge(
+            *(
+                self._wallet_transactions_after(wallet.address, position)
+                for wallet in self.wallet_repository.get_user_wallets(user)
+            ),
+            key=self._position,
+        ):
+            if self._position(transaction) != last:
+                last = self._position(transaction)
+                yield transaction
+
+    def _page(self, transactions: Iterator[Transaction], limit: int) -> TransactionPage:
+        page = list(islice(transactions, limit + 1))
+        if len(page) <= limit:
+            return TransactionPage(page)
+        return TransactionPage(page[:limit], encode_cursor(self._position(page[-2])))
@@ -0,0 +1,12 @@
+from typing import ContextManager, Iterable, Optional
+
+from wallet.infra.repository.memory.lock import StripedLock
+from wallet.infra.repository.repository_interface import IUnitOfWork
+
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self, locks: Optional[StripedLock] = None) -> None:
+        self.locks = locks or StripedLock()
+
+    def atomic(self, addresses: Iterable[str] = ()) -> ContextManager[None]:
+        return self.locks.hold(addresses)
@@ -1,6 +1,7 @@
-from typing import Dict
+from typing import Dict, List
 from uuid import UUID
 
+from wallet.core.entity.result import BulkResult
 from wallet.core.entity.user import User
 from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
 from wallet.infra.repository.repository_interface import IUserRepository
@@ -9,6 +10,8 @@ from wallet.infra.repository.repository_interface import IUserRepository
 class UserRepository(IUserRepository):
     def __init__(self) -> None:
         self.users: Dict[UUID, User] = {}
+        self.emails: Dict[str, UUID] = {}
+        self.api_keys: Dict[str, UUID] = {}
 
     def get_user_by_id(self, user_id: UUID) -> User:
         try:
@@ -17,27 +20,38 @@ class UserRepository(IUserRepository):
             raise DoesNotExistError(f"User with id {user_id} not found")
 
     def get_user_by_email(self, email: str) -> User:
-        for user in self.users.values():
-            if user.email == email:
-                return user
-        raise DoesNotExistError(f"User with email {email} not found")
+        try:
+            return self.users[self.emails[email]]
+        except KeyError:
+            raise DoesNotExistError(f"User with email {email} not found")
 
     def get_user_by_api_key(self, api_key: str) -> User:
-        for user in self.users.values():
-            if user.api_key == api_key:
-                return user
-        raise DoesNotExistError(f"User with api_key {api_key} not found")
+        try:
+            return self.users[self.api_keys[api_key]]
+        except KeyError:
+            raise DoesNotExistError(f"User with api_key {api_key} not found")
 
     def create_user(self, user: User) -> User:
         if user.user_id in self.users:
             raise AlreadyExistsError(f"User with id {user.user_id} already exists")
 
-        if [u for u in self.users.values() if u.email == user.email]:
+        if user.email in self.emails:
             raise AlreadyExistsError(f"User with email {user.email} already exists")
 
         self.users[user.user_id] = user
+        self.emails[user.email] = user.user_id
+        self.api_keys[user.api_key] = user.user_id
         return user
 
+    def create_users(self, users: List[User]) -> List[BulkResult[User]]:
+        results = []
+        for user in users:
+            try:
+                results.append(BulkResult(self.create_user(user)))
+            except AlreadyExistsError as err:
+                results.append(BulkResult(user, err))
+        return results
+
     def get_api_key_by_id(self, user_id: UUID) -> str:
         return self.get_user_by_id(user_id).api_key
 
@@ -46,3 +60,5 @@ class UserRepository(IUserRepository):
 
     def tear_down(self) -> None:
         self.users = {}
+        self.emails = {}
+        self.api_keys = {}
@@ -1,16 +1,25 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
 
 from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
-from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    NotEnoughBalanceError,
+)
+from wallet.infra.repository.memory.lock import StripedLock
 from wallet.infra.repository.repository_interface import IWalletRepository
 
 
 class WalletRepository(IWalletRepository):
     wallets: Dict[str, Wallet]
+    user_wallets: Dict[UUID, List[str]]
 
-    def __init__(self) -> None:
+    def __init__(self, locks: Optional[StripedLock] = None) -> None:
         self.wallets = {}
+        self.user_wallets = {}
+        self.locks = locks or StripedLock()
 
     def get_wallet(self, address: str) -> Wallet:
         try:
@@ -25,21 +34,41 @@ class WalletRepository(IWalletRepository):
             )
 
         self.wallets[wallet.address] = wallet
+        self.user_wallets.setdefault(wallet.user_id, []).append(wallet.address)
         return wallet
 
+    def get_wallets(self, addresses: Iterable[str]) -> List[Wallet]:
+        return [self.wallets[a] for a in addresses if a in self.wallets]
+
     def get_user_wallets(self, user: User) -> List[Wallet]:
-        return [
-            self.wallets[a]
-            for a in self.wallets
-            if self.wallets[a].user_id == user.user_id
-        ]
+        return [self.wallets[a] for a in self.user_wallets.get(user.user_id, [])]
 
     def update_amount(self, address: str, amount: int) -> Wallet:
         try:
-            self.wallets[address].amount = amount
+            with self.locks.hold([address]):
+                self.wallets[address].amount = amount
             return self.get_wallet(address)
         except KeyError:
             raise DoesNotExistError(f"Wallet with address {address} does not exist")
 
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        from_wallet = self.get_wallet(from_address)
+        to_wallet = self.get_wallet(to_address)
+        with self.locks.hold([from_address, to_address]):
+            if from_wallet.amount < required_balance:
+                raise NotEnoughBalanceError("Not enough balance in the wallet.")
+
+            from_wallet.amount -= amount
+            to_wallet.amount += amount
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        wallets = [self.get_wallet(address) for address in changes]
+        with self.locks.hold(changes):
+            for wallet in wallets:
+                wallet.amount += changes[wallet.address]
+
     def tear_down(self) -> None:
         self.wallets = {}
+        self.user_wallets = {}
@@ -1,10 +1,21 @@
-from typing import List, Protocol
+from typing import (
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+)
 from uuid import UUID
 
-from wallet.core.entity.transaction import Transaction
+from wallet.core.entity.result import BulkResult
+from wallet.core.entity.transaction import Transaction, TransactionPage
 from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
 
+TRANSACTION_BATCH_SIZE = 1_000
+
 
 class IUserRepository(Protocol):
     def get_user_by_id(self, user_id: UUID) -> User:
@@ -19,6 +30,9 @@ class IUserRepository(Protocol):
     def create_user(self, user: User) -> User:
         pass
 
+    def create_users(self, users: List[User]) -> List[BulkResult[User]]:
+        pass
+
     def get_api_key_by_id(self, user_id: UUID) -> str:
         pass
 
@@ -33,21 +47,53 @@ class ITransactionRepository(Protocol):
     def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
         pass
 
-    def get_all_transactions(self) -> List[Transaction]:
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        pass
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
         pass
 
     def create_transaction(self, transaction: Transaction) -> Transaction:
         pass
 
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        pass
+
     def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
         pass
 
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        pass
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        pass
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        pass
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        pass
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        pass
+
     def get_transaction_count(self) -> int:
         pass
 
     def get_profit(self) -> int:
         pass
 
+    def reconcile_statistics(self) -> None:
+        pass
+
     def tear_down(self) -> None:
         pass
 
@@ -59,11 +105,27 @@ class IWalletRepository(Protocol):
     def create_wallet(self, wallet: Wallet) -> Wallet:
         pass
 
+    def get_wallets(self, addresses: Iterable[str]) -> List[Wallet]:
+        pass
+
     def get_user_wallets(self, user: User) -> List[Wallet]:
         pass
 
     def update_amount(self, address: str, amount: int) -> Wallet:
         pass
 
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        pass
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        pass
+
     def tear_down(self) -> None:
         pass
+
+
+class IUnitOfWork(Protocol):
+    def atomic(self, addresses: Iterable[str] = ()) -> ContextManager[None]:
+        pass
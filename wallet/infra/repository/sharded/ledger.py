@@ -0,0 +1,422 @@
+import os
+import threading
+from bisect import bisect_right, insort
+from collections import defaultdict
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from functools import partial
+from heapq import merge
+from itertools import count, islice
+from queue import SimpleQueue
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    ParamSpec,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from wallet.core.entity.transaction import Transaction
+from wallet.core.entity.wallet import Wallet
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    NotEnoughBalanceError,
+)
+
+DEFAULT_SHARDS = os.cpu_count() or 1
+
+P = ParamSpec("P")
+T = TypeVar("T")
+Request = Tuple[Callable[[], Any], "Future[Any]"]
+
+
+class Shard:
+    def __init__(
+        self, name: str, positions: Dict[UUID, int], counter: Iterator[int]
+    ) -> None:
+        self.name = name
+        self.positions = positions
+        self.counter = counter
+        self.wallets: Dict[str, Wallet] = {}
+        self.transactions: Dict[UUID, Transaction] = {}
+        self.ordered: List[Transaction] = []
+        self.address_index: Dict[str, List[Transaction]] = {}
+        self.transaction_count = 0
+        self.profit = 0
+        self.requests: "SimpleQueue[Optional[Request]]" = SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+
+    def submit(
+        self, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> "Future[T]":
+        if self.thread is None:
+            raise RuntimeError(f"Shard {self.name} is not started")
+
+        future: Future[T] = Future()
+        self.requests.put((partial(function, *args, **kwargs), future))
+        return future
+
+    def call(self, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        return self.submit(function, *args, **kwargs).result()
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def get_wallet(self, address: str) -> Wallet:
+        try:
+            return self.wallets[address]
+        except KeyError:
+            raise DoesNotExistError(f"Wallet with address {address} not found")
+
+    def copy_wallet(self, address: str) -> Wallet:
+        wallet = self.get_wallet(address)
+        return Wallet(wallet.address, wallet.amount, wallet.user_id)
+
+    def create_wallet(self, wallet: Wallet) -> Wallet:
+        if wallet.address in self.wallets:
+            raise AlreadyExistsError(
+                f"Wallet with address {wallet.address} already exists"
+            )
+
+        self.wallets[wallet.address] = wallet
+        return wallet
+
+    def set_amount(self, address: str, amount: int) -> None:
+        self.get_wallet(address).amount = amount
+
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        from_wallet = self.get_wallet(from_address)
+        to_wallet = self.get_wallet(to_address)
+        if from_wallet.amount < required_balance:
+            raise NotEnoughBalanceError("Not enough balance in the wallet.")
+
+        from_wallet.amount -= amount
+        to_wallet.amount += amount
+
+    def debit(self, address: str, amount: int, required_balance: int) -> None:
+        wallet = self.get_wallet(address)
+        if wallet.amount < required_balance:
+            raise NotEnoughBalanceError("Not enough balance in the wallet.")
+
+        wallet.amount -= amount
+
+    def credit(self, address: str, amount: int) -> None:
+        self.get_wallet(address).amount += amount
+
+    def check_wallets(self, addresses: Iterable[str]) -> None:
+        for address in addresses:
+            self.get_wallet(address)
+
+    def withdraw(self, changes: Dict[str, int]) -> None:
+        self.check_wallets(changes)
+        debits = {address: change for address, change in changes.items() if change < 0}
+        if any(self.wallets[a].amount + change < 0 for a, change in debits.items()):
+            raise NotEnoughBalanceError("Not enough balance in the wallet.")
+        for address, change in debits.items():
+            self.wallets[address].amount += change
+
+    def deposit(self, changes: Dict[str, int]) -> None:
+        for address, change in changes.items():
+            if change > 0:
+                self.wallets[address].amount += change
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        self.withdraw(changes)
+        self.deposit(changes)
+
+    def check_transactions(self, transaction_ids: Iterable[UUID]) -> None:
+        if any(i in self.transactions for i in transaction_ids):
+            raise AlreadyExistsError("Some of the transactions already exist")
+
+    def get_transaction(self, transaction_id: UUID) -> Transaction:
+        try:
+            return self.transactions[transaction_id]
+        except KeyError:
+            raise DoesNotExistError(
+                f"Transaction with id {str(transaction_id)} not found"
+            )
+
+    def store_transaction(self, transaction: Transaction) -> None:
+        if transaction.transaction_id in self.transactions:
+            raise AlreadyExistsError(
+                f"Transaction with id {str(transaction.transaction_id)} already exists"
+            )
+
+        self.positions[transaction.transaction_id] = next(self.counter)
+        self.transactions[transaction.transaction_id] = transaction
+        self.ordered.append(transaction)
+        self.transaction_count += 1
+        self.profit += transaction.fee
+
+    def store_transactions(self, transactions: List[Transaction]) -> None:
+        self.check_transactions(t.transaction_id for t in transactions)
+        for transaction in transactions:
+            self.store_transaction(transaction)
+
+    def index_transactions(self, entries: List[Tuple[str, Transaction]]) -> None:
+        for address, transaction in entries:
+            insort(
+                self.address_index.setdefault(address, []),
+                transaction,
+                key=self.position,
+            )
+
+    def transactions_after(
+        self, address: str, position: int, limit: Optional[int] = None
+    ) -> List[Transaction]:
+        transactions = self.address_index.get(address, [])
+        start = bisect_right(transactions, position, key=self.position)
+        end = None if limit is None else start + limit
+        return transactions[start:end]
+
+    def stored_transactions_after(self, position: int, limit: int) -> List[Transaction]:
+        start = bisect_right(self.ordered, position, key=self.position)
+        end = start + limit
+        return self.ordered[start:end]
+
+    def statistics(self) -> Tuple[int, int]:
+        return self.transaction_count, self.profit
+
+    def reconcile_statistics(self) -> None:
+        self.transaction_count = len(self.transactions)
+        self.profit = sum(v.fee for v in self.transactions.values())
+
+    def clear_wallets(self) -> None:
+        self.wallets = {}
+
+    def clear_transactions(self) -> None:
+        self.transactions = {}
+        self.ordered = []
+        self.address_index = {}
+        self.transaction_count = 0
+        self.profit = 0
+
+    def position(self, transaction: Transaction) -> int:
+        return self.positions[transaction.transaction_id]
+
+    def _run(self) -> None:
+        while (request := self.requests.get()) is not None:
+            function, future = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function())
+            except BaseException as err:
+                future.set_exception(err)
+
+
+class ShardedLedger:
+    def __init__(self, shard_count: int = DEFAULT_SHARDS) -> None:
+        self.positions: Dict[UUID, int] = {}
+        self.counter = count(1)
+        self.shards = [
+            Shard(f"wallet-shard-{i}", self.positions, self.counter)
+            for i in range(shard_count)
+        ]
+        self.local = threading.local()
+        self.store_lock = threading.Lock()
+
+    def shard(self, key: str) -> Shard:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def transaction_shard(self, transaction_id: UUID) -> Shard:
+        return self.shard(str(transaction_id))
+
+    def start(self) -> None:
+        for shard in self.shards:
+            shard.start()
+
+    def stop(self) -> None:
+        for shard in self.shards:
+            shard.stop()
+
+    def clear_wallets(self) -> None:
+        self._all(Shard.clear_wallets)
+
+    def clear_transactions(self) -> None:
+        self._all(Shard.clear_transactions)
+        self.positions.clear()
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        if getattr(self.local, "staged", None) is not None:
+            yield
+            return
+
+        staged: List[Transaction] = []
+        self.local.staged = staged
+        try:
+            yield
+        finally:
+            self.local.staged = None
+        if staged:
+            self._store(staged)
+
+    def get_wallet(self, address: str) -> Wallet:
+        shard = self.shard(address)
+        return shard.call(shard.copy_wallet, address)
+
+    def create_wallet(self, wallet: Wallet) -> Wallet:
+        shard = self.shard(wallet.address)
+        return shard.call(shard.create_wallet, wallet)
+
+    def set_amount(self, address: str, amount: int) -> None:
+        shard = self.shard(address)
+        shard.call(shard.set_amount, address, amount)
+
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        source = self.shard(from_address)
+        destination = self.shard(to_address)
+        if source is destination:
+            source.call(
+                source.transfer, from_address, to_address, amount, required_balance
+            )
+            return
+
+        debit = source.submit(source.debit, from_address, amount, required_balance)
+        check = destination.submit(destination.check_wallets, [to_address])
+        wait((debit, check))
+        if debit.exception() is None and check.exception() is not None:
+            source.call(source.credit, from_address, amount)
+        for vote in (debit, check):
+            vote.result()
+        destination.call(destination.credit, to_address, amount)
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        grouped = self._group(changes, self.shard)
+        parts = {
+            shard: {address: changes[address] for address in addresses}
+            for shard, addresses in grouped.items()
+        }
+        if len(parts) == 1:
+            for shard, part in parts.items():
+                shard.call(shard.apply_balance_changes, part)
+            return
+
+        votes = {
+            shard: shard.submit(shard.withdraw, part) for shard, part in parts.items()
+        }
+        wait(votes.values())
+        failed = [vote for vote in votes.values() if vote.exception() is not None]
+        if failed:
+            self._gather(
+                shard.submit(
+                    shard.deposit,
+                    {address: -change for address, change in parts[shard].items()},
+                )
+                for shard, vote in votes.items()
+                if vote.exception() is None
+            )
+            failed[0].result()
+        self._gather(shard.submit(shard.deposit, part) for shard, part in parts.items())
+
+    def create_transaction(self, transaction: Transaction) -> Transaction:
+        self.create_transactions([transaction])
+        return transaction
+
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        staged = getattr(self.local, "staged", None)
+        if staged is not None:
+            staged.extend(transactions)
+        else:
+            self._store(transactions)
+
+    def _store(self, transactions: List[Transaction]) -> None:
+        grouped = self._group(
+            transactions, lambda t: self.transaction_shard(t.transaction_id)
+        )
+        with self.store_lock:
+            if len(grouped) > 1:
+                self._gather(
+                    shard.submit(
+                        shard.check_transactions, [t.transaction_id for t in part]
+                    )
+                    for shard, part in grouped.items()
+                )
+            self._gather(
+                shard.submit(shard.store_transactions, part)
+                for shard, part in grouped.items()
+            )
+            self._index(transactions)
+
+    def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
+        shard = self.transaction_shard(transaction_id)
+        return shard.call(shard.get_transaction, transaction_id)
+
+    def stored_transactions_after(self, position: int, limit: int) -> List[Transaction]:
+        with self.store_lock:
+            parts = self._gather(
+                shard.submit(shard.stored_transactions_after, position, limit)
+                for shard in self.shards
+            )
+        return list(islice(merge(*parts, key=self.position), limit))
+
+    def transactions_after(
+        self, address: str, position: int, limit: Optional[int] = None
+    ) -> List[Transaction]:
+        shard = self.shard(address)
+        return shard.call(shard.transactions_after, address, position, limit)
+
+    def get_transaction_count(self) -> int:
+        return sum(count for count, _ in self._statistics())
+
+    def get_profit(self) -> int:
+        return sum(profit for _, profit in self._statistics())
+
+    def reconcile_statistics(self) -> None:
+        self._all(Shard.reconcile_statistics)
+
+    def position(self, transaction: Transaction) -> int:
+        return self.positions[transaction.transaction_id]
+
+    def _index(self, transactions: List[Transaction]) -> None:
+        entries = [
+            (address, transaction)
+            for transaction in transactions
+            for address in {transaction.from_address, transaction.to_address}
+        ]
+        grouped = self._group(entries, lambda entry: self.shard(entry[0]))
+        self._gather(
+            shard.submit(shard.index_transactions, part)
+            for shard, part in grouped.items()
+        )
+
+    def _statistics(self) -> List[Tuple[int, int]]:
+        return self._gather(shard.submit(shard.statistics) for shard in self.shards)
+
+    def _all(self, function: Callable[[Shard], None]) -> None:
+        self._gather(shard.submit(function, shard) for shard in self.shards)
+
+    @staticmethod
+    def _group(items: Iterable[T], route: Callable[[T], Shard]) -> Dict[Shard, List[T]]:
+        grouped: Dict[Shard, List[T]] = defaultdict(list)
+        for item in items:
+            grouped[route(item)].append(item)
+        return grouped
+
+    @staticmethod
+    def _gather(futures: Iterable["Future[T]"]) -> List[T]:
+        pending = list(futures)
+        wait(pending)
+        return [future.result() for future in pending]
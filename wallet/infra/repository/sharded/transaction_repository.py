@@ -0,0 +1,119 @@
+from heapq import merge
+from itertools import islice
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from wallet.core.entity.transaction import Transaction, TransactionPage
+from wallet.core.entity.user import User
+from wallet.core.entity.wallet import Wallet
+from wallet.infra.repository.cursor import decode_cursor, encode_cursor
+from wallet.infra.repository.repository_interface import (
+    TRANSACTION_BATCH_SIZE,
+    ITransactionRepository,
+    IWalletRepository,
+)
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+
+
+class TransactionRepository(ITransactionRepository):
+    def __init__(
+        self, ledger: ShardedLedger, wallet_repository: IWalletRepository
+    ) -> None:
+        self.ledger = ledger
+        self.wallet_repository = wallet_repository
+
+    def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
+        return self.ledger.get_transaction_by_id(transaction_id)
+
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        position = 0
+        while transactions := self.ledger.stored_transactions_after(
+            position, batch_size
+        ):
+            yield from transactions
+            position = self.ledger.position(transactions[-1])
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(
+            iter(
+                self.ledger.stored_transactions_after(decode_cursor(cursor), limit + 1)
+            ),
+            limit,
+        )
+
+    def create_transaction(self, transaction: Transaction) -> Transaction:
+        return self.ledger.create_transaction(transaction)
+
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        self.ledger.create_transactions(transactions)
+
+    def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
+        return self.ledger.transactions_after(wallet.address, 0)
+
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        return list(self._user_transactions_after(user, 0))
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(
+            iter(
+                self.ledger.transactions_after(
+                    wallet.address, decode_cursor(cursor), limit + 1
+                )
+            ),
+            limit,
+        )
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(
+            self._user_transactions_after(user, decode_cursor(cursor), limit + 1),
+            limit,
+        )
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        return iter(self.ledger.transactions_after(wallet.address, 0))
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        return self._user_transactions_after(user, 0)
+
+    def get_transaction_count(self) -> int:
+        return self.ledger.get_transaction_count()
+
+    def get_profit(self) -> int:
+        return self.ledger.get_profit()
+
+    def reconcile_statistics(self) -> None:
+        self.ledger.reconcile_statistics()
+
+    def tear_down(self) -> None:
+        self.ledger.clear_transactions()
+
+    def _user_transactions_after(
+        self, user: User, position: int, limit: Optional[int] = None
+    ) -> Iterator[Transaction]:
+        last = position
+        for transaction in merge(
+            *(
+                self.ledger.transactions_after(wallet.address, position, limit)
+                for wallet in self.wallet_repository.get_user_wallets(user)
+            ),
+            key=self.ledger.position,
+        ):
+            if self.ledger.position(transaction) != last:
+                last = self.ledger.position(transaction)
+                yield transaction
+
+    def _page(self, transactions: Iterator[Transaction], limit: int) -> TransactionPage:
+        page = list(islice(transactions, limit + 1))
+        if len(page) <= limit:
+            return TransactionPage(page)
+        return TransactionPage(
+            page[:limit], encode_cursor(self.ledger.position(page[-2]))
+        )
@@ -0,0 +1,12 @@
+from typing import ContextManager, Iterable
+
+from wallet.infra.repository.repository_interface import IUnitOfWork
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self, ledger: ShardedLedger) -> None:
+        self.ledger = ledger
+
+    def atomic(self, addresses: Iterable[str] = ()) -> ContextManager[None]:
+        return self.ledger.atomic()
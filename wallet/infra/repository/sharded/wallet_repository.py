@@ -0,0 +1,56 @@
+import threading
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from wallet.core.entity.user import User
+from wallet.core.entity.wallet import Wallet
+from wallet.core.error.errors import DoesNotExistError
+from wallet.infra.repository.repository_interface import IWalletRepository
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+
+
+class WalletRepository(IWalletRepository):
+    def __init__(self, ledger: ShardedLedger) -> None:
+        self.ledger = ledger
+        self.user_wallets: Dict[UUID, List[str]] = {}
+        self.lock = threading.Lock()
+
+    def get_wallet(self, address: str) -> Wallet:
+        return self.ledger.get_wallet(address)
+
+    def create_wallet(self, wallet: Wallet) -> Wallet:
+        self.ledger.create_wallet(wallet)
+        with self.lock:
+            self.user_wallets.setdefault(wallet.user_id, []).append(wallet.address)
+        return wallet
+
+    def get_wallets(self, addresses: Iterable[str]) -> List[Wallet]:
+        wallets = []
+        for address in addresses:
+            try:
+                wallets.append(self.ledger.get_wallet(address))
+            except DoesNotExistError:
+                pass
+        return wallets
+
+    def get_user_wallets(self, user: User) -> List[Wallet]:
+        with self.lock:
+            addresses = list(self.user_wallets.get(user.user_id, []))
+        return self.get_wallets(addresses)
+
+    def update_amount(self, address: str, amount: int) -> Wallet:
+        self.ledger.set_amount(address, amount)
+        return self.get_wallet(address)
+
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        self.ledger.transfer(from_address, to_address, amount, required_balance)
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        self.ledger.apply_balance_changes(changes)
+
+    def tear_down(self) -> None:
+        self.ledger.clear_wallets()
+        with self.lock:
+            self.user_wallets = {}
@@ -1,30 +1,238 @@
 import sqlite3
-from typing import List
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
 
 DATABASE_NAME = "wallet.db"
 
+REQUEST_DURABILITY = "request"
+GROUP_DURABILITY = "group"
+FULL_DURABILITY = "full"
+DURABILITY_MODES = (REQUEST_DURABILITY, GROUP_DURABILITY, FULL_DURABILITY)
+
 
 class ConnectionManager:
-    connections: List[sqlite3.Connection] = []
+    connections: Dict[sqlite3.Connection, Optional[threading.Thread]] = {}
+    shared: Optional[sqlite3.Connection] = None
+    local = threading.local()
+    generation: int = 0
+    lock = threading.RLock()
+
+    database: str = DATABASE_NAME
     in_mem: bool = False
     foreign_keys: bool = True
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -64_000
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout: int = 5_000
+
+    durability: str = REQUEST_DURABILITY
+    group_commit_interval: int = 10
+    group_commit_writes: int = 100
+    pending_writes: int = 0
+    committer: Optional[threading.Thread] = None
+    committer_stopped = threading.Event()
+
+    @staticmethod
+    def shares_connection() -> bool:
+        return ConnectionManager.in_mem or (
+            ConnectionManager.durability == GROUP_DURABILITY
+        )
 
     @staticmethod
     def get_connection() -> sqlite3.Connection:
-        if len(ConnectionManager.connections) == 0:
-            ConnectionManager.connections.append(
-                sqlite3.connect(DATABASE_NAME, check_same_thread=False)
-                if not ConnectionManager.in_mem
-                else sqlite3.connect(":memory:", check_same_thread=False)
-            )
-        conn = ConnectionManager.connections[0]
-        cursor = conn.cursor()
-        cursor.execute(
+        if ConnectionManager.shares_connection():
+            with ConnectionManager.lock:
+                if ConnectionManager.shared is None:
+                    ConnectionManager.shared = ConnectionManager.connect()
+                return ConnectionManager.shared
+
+        local = ConnectionManager.local
+        if getattr(local, "generation", None) != ConnectionManager.generation:
+            local.connection = ConnectionManager.connect(threading.current_thread())
+            local.generation = ConnectionManager.generation
+        connection: sqlite3.Connection = local.connection
+        return connection
+
+    @staticmethod
+    def connect(owner: Optional[threading.Thread] = None) -> sqlite3.Connection:
+        ConnectionManager.prune()
+        conn = sqlite3.connect(
+            ":memory:" if ConnectionManager.in_mem else ConnectionManager.database,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=ConnectionManager.busy_timeout / 1000,
+        )
+        if not ConnectionManager.in_mem:
+            conn.execute(f"PRAGMA journal_mode = {ConnectionManager.journal_mode}")
+            conn.execute(f"PRAGMA mmap_size = {ConnectionManager.mmap_size}")
+        synchronous = (
+            ConnectionManager.synchronous
+            if ConnectionManager.durability == REQUEST_DURABILITY
+            else "FULL"
+        )
+        conn.execute(f"PRAGMA synchronous = {synchronous}")
+        conn.execute(f"PRAGMA cache_size = {ConnectionManager.cache_size}")
+        conn.execute(f"PRAGMA busy_timeout = {ConnectionManager.busy_timeout}")
+        conn.execute(
             "PRAGMA foreign_keys = "
-            f"{'ON' if ConnectionManager.foreign_keys else 'OFF'};"
+            f"{'ON' if ConnectionManager.foreign_keys else 'OFF'}"
         )
-        cursor.close()
-        return ConnectionManager.connections[0]
+        with ConnectionManager.lock:
+            ConnectionManager.connections[conn] = owner
+        return conn
+
+    @staticmethod
+    def prune() -> None:
+        with ConnectionManager.lock:
+            abandoned = [
+                connection
+                for connection, owner in ConnectionManager.connections.items()
+                if owner is not None and not owner.is_alive()
+            ]
+            for connection in abandoned:
+                del ConnectionManager.connections[connection]
+                connection.close()
+
+    @staticmethod
+    @contextmanager
+    def dedicated() -> Iterator[sqlite3.Connection]:
+        if ConnectionManager.in_mem:
+            yield ConnectionManager.get_connection()
+            return
+
+        conn = ConnectionManager.connect()
+        try:
+            yield conn
+        finally:
+            ConnectionManager.release(conn)
+
+    @staticmethod
+    def release(conn: sqlite3.Connection) -> None:
+        with ConnectionManager.lock:
+            ConnectionManager.connections.pop(conn, None)
+        conn.close()
+
+    @staticmethod
+    def guard() -> ContextManager[object]:
+        if ConnectionManager.shares_connection():
+            return ConnectionManager.lock
+        return nullcontext()
+
+    @staticmethod
+    @contextmanager
+    def atomic() -> Iterator[None]:
+        local = ConnectionManager.local
+        with ConnectionManager.guard():
+            if getattr(local, "depth", 0) > 0:
+                local.depth += 1
+                try:
+                    yield
+                finally:
+                    local.depth -= 1
+                return
+
+            conn = ConnectionManager.get_connection()
+            if ConnectionManager.durability == GROUP_DURABILITY:
+                local.depth = 1
+                try:
+                    with ConnectionManager.savepoint(conn):
+                        yield
+                finally:
+                    local.depth = 0
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            local.depth = 1
+            try:
+                yield
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                local.depth = 0
+
+    @staticmethod
+    @contextmanager
+    def savepoint(conn: sqlite3.Connection) -> Iterator[None]:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+            ConnectionManager.start_committer()
+        conn.execute("SAVEPOINT unit_of_work")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK TO unit_of_work")
+            conn.execute("RELEASE unit_of_work")
+            raise
+        conn.execute("RELEASE unit_of_work")
+        ConnectionManager.pending_writes += 1
+        if ConnectionManager.pending_writes >= ConnectionManager.group_commit_writes:
+            ConnectionManager.flush()
+
+    @staticmethod
+    def flush() -> None:
+        with ConnectionManager.lock:
+            shared = ConnectionManager.shared
+            if shared is not None and shared.in_transaction:
+                shared.commit()
+            ConnectionManager.pending_writes = 0
+
+    @staticmethod
+    def start_committer() -> None:
+        with ConnectionManager.lock:
+            if ConnectionManager.committer is not None:
+                return
+            ConnectionManager.committer_stopped.clear()
+            ConnectionManager.committer = threading.Thread(
+                target=ConnectionManager._commit_periodically,
+                name="wallet-group-commit",
+                daemon=True,
+            )
+            ConnectionManager.committer.start()
+
+    @staticmethod
+    def stop_committer() -> None:
+        committer = ConnectionManager.committer
+        if committer is None:
+            return
+        ConnectionManager.committer_stopped.set()
+        committer.join()
+        ConnectionManager.committer = None
+
+    @staticmethod
+    def _commit_periodically() -> None:
+        interval = ConnectionManager.group_commit_interval / 1000
+        while not ConnectionManager.committer_stopped.wait(interval):
+            ConnectionManager.flush()
+
+    @staticmethod
+    def configure(
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -64_000,
+        mmap_size: int = 256 * 1024 * 1024,
+        busy_timeout: int = 5_000,
+        durability: str = REQUEST_DURABILITY,
+        group_commit_interval: int = 10,
+        group_commit_writes: int = 100,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode {durability}")
+        ConnectionManager.journal_mode = journal_mode
+        ConnectionManager.synchronous = synchronous
+        ConnectionManager.cache_size = cache_size
+        ConnectionManager.mmap_size = mmap_size
+        ConnectionManager.busy_timeout = busy_timeout
+        ConnectionManager.durability = durability
+        ConnectionManager.group_commit_interval = group_commit_interval
+        ConnectionManager.group_commit_writes = group_commit_writes
+
+    @staticmethod
+    def set_database(database: str) -> None:
+        ConnectionManager.database = database
 
     @staticmethod
     def set_in_mem(in_mem: bool) -> None:
@@ -33,8 +241,19 @@ class ConnectionManager:
     @staticmethod
     def set_foreign_keys(foreign_keys: bool) -> None:
         ConnectionManager.foreign_keys = foreign_keys
+        with ConnectionManager.lock:
+            for connection in ConnectionManager.connections:
+                connection.execute(
+                    f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}"
+                )
 
     @staticmethod
     def close_all() -> None:
-        for connection in ConnectionManager.connections:
-            connection.close()
+        ConnectionManager.stop_committer()
+        ConnectionManager.flush()
+        with ConnectionManager.lock:
+            for connection in ConnectionManager.connections:
+                connection.close()
+            ConnectionManager.connections = {}
+            ConnectionManager.shared = None
+            ConnectionManager.generation += 1
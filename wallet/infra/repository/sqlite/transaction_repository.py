@@ -1,15 +1,49 @@
+import sqlite3
 from contextlib import closing
-from typing import List
+from heapq import merge
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Iterator, List, Optional, Tuple
 from uuid import UUID
 
-from wallet.core.entity.transaction import Transaction, TransactionBuilder
+from wallet.core.entity.transaction import Transaction, TransactionPage
+from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
 from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
-from wallet.infra.repository.repository_interface import ITransactionRepository
+from wallet.infra.repository.cursor import decode_cursor, encode_cursor
+from wallet.infra.repository.repository_interface import (
+    TRANSACTION_BATCH_SIZE,
+    ITransactionRepository,
+)
 from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
 from wallet.infra.repository.sqlite.wallet_repository import WALLET_TABLE_NAME
 
 TRANSACTION_TABLE_NAME = "transactions"
+STATISTICS_TABLE_NAME = "statistics"
+
+POSITION_COLUMN = -1
+
+TRANSACTIONS_AFTER = f"""
+    SELECT *, rowid AS position FROM {TRANSACTION_TABLE_NAME}
+    WHERE rowid > ? ORDER BY rowid LIMIT ?"""
+
+WALLET_TRANSACTIONS_AFTER = f"""
+    SELECT *, rowid AS position FROM {TRANSACTION_TABLE_NAME}
+    WHERE From_Address = ? AND rowid > ?
+    UNION
+    SELECT *, rowid AS position FROM {TRANSACTION_TABLE_NAME}
+    WHERE To_Address = ? AND rowid > ?
+    ORDER BY position LIMIT ?"""
+
+USER_WALLET_ADDRESSES = f"SELECT Address FROM {WALLET_TABLE_NAME} WHERE User_ID = ?"
+
+
+def to_transaction(row: Tuple[Any, ...]) -> Transaction:
+    return Transaction(row[1], row[2], row[3], row[4], row[0])
+
+
+def transaction_factory(_: sqlite3.Cursor, row: Tuple[Any, ...]) -> Transaction:
+    return to_transaction(row)
 
 
 class TransactionRepository(ITransactionRepository):
@@ -29,6 +63,26 @@ class TransactionRepository(ITransactionRepository):
                     REFERENCES {WALLET_TABLE_NAME}(Address)
                 );"""
             )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRANSACTION_TABLE_NAME}_from_address "
+                f"ON {TRANSACTION_TABLE_NAME}(From_Address)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRANSACTION_TABLE_NAME}_to_address "
+                f"ON {TRANSACTION_TABLE_NAME}(To_Address)"
+            )
+            cursor.execute(
+                f"""CREATE TABLE IF NOT EXISTS {STATISTICS_TABLE_NAME} (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    Transaction_Count INTEGER NOT NULL,
+                    Profit INTEGER NOT NULL
+                );"""
+            )
+            cursor.execute(
+                f"INSERT OR IGNORE INTO {STATISTICS_TABLE_NAME} "
+                f"SELECT 1, COUNT(*), COALESCE(SUM(Fee), 0) "
+                f"FROM {TRANSACTION_TABLE_NAME}"
+            )
 
     def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
         conn = ConnectionManager.get_connection()
@@ -42,88 +96,204 @@ class TransactionRepository(ITransactionRepository):
                 raise DoesNotExistError(
                     f"Transaction with id {str(transaction_id)} not found"
                 )
-            return (
-                TransactionBuilder()
-                .builder()
-                .transaction_id(transaction[0])
-                .from_address(transaction[1])
-                .to_address(transaction[1])
-                .amount(int(transaction[3]))
-                .fee(int(transaction[4]))
-                .build()
-            )
+            return to_transaction(transaction)
 
-    def get_all_transactions(self) -> List[Transaction]:
-        conn = ConnectionManager.get_connection()
-        with closing(conn.cursor()) as cursor:
-            cursor.execute(f"SELECT * FROM {TRANSACTION_TABLE_NAME}")
-            transactions = cursor.fetchall()
-            return [
-                TransactionBuilder()
-                .builder()
-                .transaction_id(t[0])
-                .from_address(t[1])
-                .to_address(t[2])
-                .amount(int(t[3]))
-                .fee(int(t[4]))
-                .build()
-                for t in transactions
-            ]
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        with ConnectionManager.dedicated() as conn:
+            with closing(conn.cursor()) as cursor:
+                cursor.execute(f"SELECT * FROM {TRANSACTION_TABLE_NAME} ORDER BY rowid")
+                cursor.row_factory = transaction_factory
+                while transactions := cursor.fetchmany(batch_size):
+                    yield from transactions
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        return self._page(TRANSACTIONS_AFTER, (decode_cursor(cursor), limit + 1), limit)
 
     def create_transaction(self, transaction: Transaction) -> Transaction:
         conn = ConnectionManager.get_connection()
-        try:
-            with closing(conn.cursor()) as cursor:
-                cursor.execute(
-                    f"INSERT INTO {TRANSACTION_TABLE_NAME} VALUES (?, ?, ?, ?, ?)",
-                    (
-                        str(transaction.transaction_id),
-                        transaction.from_address,
-                        transaction.to_address,
-                        transaction.amount,
-                        transaction.fee,
-                    ),
-                )
-        except Exception as e:
-            raise AlreadyExistsError(
-                f"Transaction with id {transaction.transaction_id} already exists"
-            ) from e
+        with ConnectionManager.atomic():
+            try:
+                with closing(conn.cursor()) as cursor:
+                    cursor.execute(
+                        f"INSERT INTO {TRANSACTION_TABLE_NAME} VALUES (?, ?, ?, ?, ?)",
+                        (
+                            str(transaction.transaction_id),
+                            transaction.from_address,
+                            transaction.to_address,
+                            transaction.amount,
+                            transaction.fee,
+                        ),
+                    )
+            except Exception as e:
+                raise AlreadyExistsError(
+                    f"Transaction with id {transaction.transaction_id} already exists"
+                ) from e
+            self._add_to_statistics(1, transaction.fee)
         return transaction
 
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        conn = ConnectionManager.get_connection()
+        with ConnectionManager.atomic():
+            try:
+                with closing(conn.cursor()) as cursor:
+                    cursor.executemany(
+                        f"INSERT INTO {TRANSACTION_TABLE_NAME} VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                str(t.transaction_id),
+                                t.from_address,
+                                t.to_address,
+                                t.amount,
+                                t.fee,
+                            )
+                            for t in transactions
+                        ],
+                    )
+            except Exception as e:
+                raise AlreadyExistsError(
+                    "Some of the transactions already exist"
+                ) from e
+            self._add_to_statistics(len(transactions), sum(t.fee for t in transactions))
+
     def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
-            cursor.execute(f"SELECT * FROM {TRANSACTION_TABLE_NAME}")
-            transactions = cursor.fetchall()
-            return [
-                TransactionBuilder()
-                .builder()
-                .transaction_id(t[0])
-                .from_address(t[1])
-                .to_address(t[2])
-                .amount(int(t[3]))
-                .fee(int(t[4]))
-                .build()
-                for t in transactions
-                if wallet.address in (t[1], t[2])
-            ]
+            cursor.execute(
+                f"SELECT * FROM {TRANSACTION_TABLE_NAME} "
+                f"WHERE From_Address = ? OR To_Address = ?",
+                (wallet.address, wallet.address),
+            )
+            cursor.row_factory = transaction_factory
+            transactions: List[Transaction] = cursor.fetchall()
+            return transactions
+
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        conn = ConnectionManager.get_connection()
+        with closing(conn.cursor()) as cursor:
+            cursor.execute(
+                f"""SELECT t.* FROM {TRANSACTION_TABLE_NAME} t
+                    JOIN {WALLET_TABLE_NAME} w ON t.From_Address = w.Address
+                    WHERE w.User_ID = ?
+                    UNION
+                    SELECT t.* FROM {TRANSACTION_TABLE_NAME} t
+                    JOIN {WALLET_TABLE_NAME} w ON t.To_Address = w.Address
+                    WHERE w.User_ID = ?""",
+                (str(user.user_id), str(user.user_id)),
+            )
+            cursor.row_factory = transaction_factory
+            transactions: List[Transaction] = cursor.fetchall()
+            return transactions
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        position = decode_cursor(cursor)
+        return self._page(
+            WALLET_TRANSACTIONS_AFTER,
+            (wallet.address, position, wallet.address, position, limit + 1),
+            limit,
+        )
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        conn = ConnectionManager.get_connection()
+        rows = self._user_rows(conn, user, decode_cursor(cursor), limit + 1)
+        return self._to_page(rows, limit)
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        return self._iterate(
+            WALLET_TRANSACTIONS_AFTER, (wallet.address, 0, wallet.address, 0, -1)
+        )
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        with ConnectionManager.dedicated() as conn:
+            position = 0
+            while rows := self._user_rows(conn, user, position, TRANSACTION_BATCH_SIZE):
+                yield from (to_transaction(row) for row in rows)
+                position = rows[-1][POSITION_COLUMN]
 
     def get_transaction_count(self) -> int:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
-            cursor.execute(f"SELECT COUNT(*) FROM {TRANSACTION_TABLE_NAME}")
+            cursor.execute(f"SELECT Transaction_Count FROM {STATISTICS_TABLE_NAME}")
             return int(cursor.fetchone()[0])
 
     def get_profit(self) -> int:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
-            cursor.execute(f"SELECT SUM(Fee) FROM {TRANSACTION_TABLE_NAME}")
-            fetched = cursor.fetchone()
-            if fetched[0] is None:
-                return 0
-            return int(fetched[0])
+            cursor.execute(f"SELECT Profit FROM {STATISTICS_TABLE_NAME}")
+            return int(cursor.fetchone()[0])
+
+    def reconcile_statistics(self) -> None:
+        conn = ConnectionManager.get_connection()
+        with ConnectionManager.atomic(), closing(conn.cursor()) as cursor:
+            cursor.execute(
+                f"""UPDATE {STATISTICS_TABLE_NAME} SET
+                    Transaction_Count = (SELECT COUNT(*) FROM {TRANSACTION_TABLE_NAME}),
+                    Profit = (
+                        SELECT COALESCE(SUM(Fee), 0) FROM {TRANSACTION_TABLE_NAME}
+                    )"""
+            )
 
     def tear_down(self) -> None:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
             cursor.execute(f"DROP TABLE {TRANSACTION_TABLE_NAME}")
+            cursor.execute(f"DROP TABLE {STATISTICS_TABLE_NAME}")
+
+    def _add_to_statistics(self, transaction_count: int, profit: int) -> None:
+        conn = ConnectionManager.get_connection()
+        with closing(conn.cursor()) as cursor:
+            cursor.execute(
+                f"UPDATE {STATISTICS_TABLE_NAME} SET "
+                f"Transaction_Count = Transaction_Count + ?, Profit = Profit + ?",
+                (transaction_count, profit),
+            )
+
+    def _page(
+        self, query: str, parameters: Tuple[Any, ...], limit: int
+    ) -> TransactionPage:
+        conn = ConnectionManager.get_connection()
+        with closing(conn.cursor()) as cursor:
+            cursor.execute(query, parameters)
+            rows = cursor.fetchall()
+        return self._to_page(rows, limit)
+
+    def _to_page(self, rows: List[Tuple[Any, ...]], limit: int) -> TransactionPage:
+        transactions = [to_transaction(row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return TransactionPage(transactions)
+        return TransactionPage(
+            transactions, encode_cursor(rows[limit - 1][POSITION_COLUMN])
+        )
+
+    def _iterate(
+        self, query: str, parameters: Tuple[Any, ...]
+    ) -> Iterator[Transaction]:
+        with ConnectionManager.dedicated() as conn:
+            with closing(conn.cursor()) as cursor:
+                cursor.execute(query, parameters)
+                cursor.row_factory = transaction_factory
+                yield from cursor
+
+    def _user_rows(
+        self, conn: sqlite3.Connection, user: User, position: int, limit: int
+    ) -> List[Tuple[Any, ...]]:
+        with closing(conn.cursor()) as cursor:
+            cursor.execute(USER_WALLET_ADDRESSES, (str(user.user_id),))
+            addresses = [row[0] for row in cursor.fetchall()]
+            pages = []
+            for address in addresses:
+                cursor.execute(
+                    WALLET_TRANSACTIONS_AFTER,
+                    (address, position, address, position, limit),
+                )
+                pages.append(cursor.fetchall())
+        position_of = itemgetter(POSITION_COLUMN)
+        rows = groupby(merge(*pages, key=position_of), position_of)
+        return [next(group) for _, group in islice(rows, limit)]
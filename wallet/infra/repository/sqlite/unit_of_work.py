@@ -0,0 +1,9 @@
+from typing import ContextManager, Iterable
+
+from wallet.infra.repository.repository_interface import IUnitOfWork
+from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
+
+
+class UnitOfWork(IUnitOfWork):
+    def atomic(self, addresses: Iterable[str] = ()) -> ContextManager[None]:
+        return ConnectionManager.atomic()
@@ -1,12 +1,20 @@
+import sqlite3
 from contextlib import closing
+from typing import Any, List, Set, Tuple
 from uuid import UUID
 
+from wallet.core.entity.result import BulkResult
 from wallet.core.entity.user import User
 from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
 from wallet.infra.repository.repository_interface import IUserRepository
 from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
 
 USER_TABLE_NAME = "users"
+QUERY_CHUNK_SIZE = 500
+
+
+def to_user(row: Tuple[Any, ...]) -> User:
+    return User(row[1], row[2], UUID(row[0]))
 
 
 class UserRepository(IUserRepository):
@@ -26,7 +34,7 @@ class UserRepository(IUserRepository):
             user = cursor.fetchone()
             if user is None:
                 raise DoesNotExistError(f"User with id {user_id} not found")
-            return User(user_id=UUID(user[0]), email=user[1], api_key=user[2])
+            return to_user(user)
 
     def get_user_by_email(self, email: str) -> User:
         conn = ConnectionManager.get_connection()
@@ -35,7 +43,7 @@ class UserRepository(IUserRepository):
             user = cursor.fetchone()
             if user is None:
                 raise DoesNotExistError(f"User with email {email} not found")
-            return User(user_id=UUID(user[0]), email=user[1], api_key=user[2])
+            return to_user(user)
 
     def get_user_by_api_key(self, api_key: str) -> User:
         conn = ConnectionManager.get_connection()
@@ -46,12 +54,12 @@ class UserRepository(IUserRepository):
             user = cursor.fetchone()
             if user is None:
                 raise DoesNotExistError(f"User with api_key {api_key} not found")
-            return User(user_id=UUID(user[0]), email=user[1], api_key=user[2])
+            return to_user(user)
 
     def create_user(self, user: User) -> User:
         conn = ConnectionManager.get_connection()
         try:
-            with closing(conn.cursor()) as cursor:
+            with ConnectionManager.atomic(), closing(conn.cursor()) as cursor:
                 cursor.execute(
                     f"INSERT INTO {USER_TABLE_NAME} VALUES (?, ?, ?)",
                     (str(user.user_id), user.email, user.api_key),
@@ -62,6 +70,30 @@ class UserRepository(IUserRepository):
             ) from e
         return user
 
+    def create_users(self, users: List[User]) -> List[BulkResult[User]]:
+        conn = ConnectionManager.get_connection()
+        results = []
+        with ConnectionManager.atomic(), closing(conn.cursor()) as cursor:
+            taken = self._existing_emails(cursor, [user.email for user in users])
+            for user in users:
+                if user.email in taken:
+                    error = AlreadyExistsError(
+                        f"User with email {user.email} already exists"
+                    )
+                    results.append(BulkResult(user, error))
+                else:
+                    taken.add(user.email)
+                    results.append(BulkResult(user))
+            cursor.executemany(
+                f"INSERT INTO {USER_TABLE_NAME} VALUES (?, ?, ?)",
+                [
+                    (str(r.item.user_id), r.item.email, r.item.api_key)
+                    for r in results
+                    if r.succeeded
+                ],
+            )
+        return results
+
     def get_api_key_by_id(self, user_id: UUID) -> str:
         return self.get_user_by_id(user_id).api_key
 
@@ -72,3 +104,16 @@ class UserRepository(IUserRepository):
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
             cursor.execute(f"DROP TABLE {USER_TABLE_NAME}")
+
+    def _existing_emails(self, cursor: sqlite3.Cursor, emails: List[str]) -> Set[str]:
+        existing: Set[str] = set()
+        for start in range(0, len(emails), QUERY_CHUNK_SIZE):
+            end = start + QUERY_CHUNK_SIZE
+            chunk = emails[start:end]
+            cursor.execute(
+                f"SELECT email FROM {USER_TABLE_NAME} "
+                f"WHERE email IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
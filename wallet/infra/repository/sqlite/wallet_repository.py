@@ -1,17 +1,33 @@
+import sqlite3
 from contextlib import closing
-from typing import List
+from typing import Any, Dict, Iterable, List, Tuple
 from uuid import UUID
 
 from wallet.core.entity.user import User
 from wallet.core.entity.wallet import Wallet
-from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    NotEnoughBalanceError,
+)
 from wallet.infra.repository.repository_interface import IWalletRepository
 from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
-from wallet.infra.repository.sqlite.user_repository import USER_TABLE_NAME
+from wallet.infra.repository.sqlite.user_repository import (
+    QUERY_CHUNK_SIZE,
+    USER_TABLE_NAME,
+)
 
 WALLET_TABLE_NAME = "wallets"
 
 
+def to_wallet(row: Tuple[Any, ...]) -> Wallet:
+    return Wallet(row[0], row[1], UUID(row[2]))
+
+
+def wallet_factory(_: sqlite3.Cursor, row: Tuple[Any, ...]) -> Wallet:
+    return to_wallet(row)
+
+
 class WalletRepository(IWalletRepository):
     def __init__(self) -> None:
         conn = ConnectionManager.get_connection()
@@ -24,6 +40,10 @@ class WalletRepository(IWalletRepository):
                     FOREIGN KEY (User_ID) REFERENCES {USER_TABLE_NAME}(ID)
                 );"""
             )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {WALLET_TABLE_NAME}_user_id "
+                f"ON {WALLET_TABLE_NAME}(User_ID)"
+            )
 
     def get_wallet(self, address: str) -> Wallet:
         conn = ConnectionManager.get_connection()
@@ -34,12 +54,12 @@ class WalletRepository(IWalletRepository):
             wallet = cursor.fetchone()
             if wallet is None:
                 raise DoesNotExistError(f"Wallet with address {address} not found")
-            return Wallet(address=wallet[0], amount=wallet[1], user_id=UUID(wallet[2]))
+            return to_wallet(wallet)
 
     def create_wallet(self, wallet: Wallet) -> Wallet:
         conn = ConnectionManager.get_connection()
         try:
-            with closing(conn.cursor()) as cursor:
+            with ConnectionManager.atomic(), closing(conn.cursor()) as cursor:
                 cursor.execute(
                     f"INSERT INTO {WALLET_TABLE_NAME} VALUES (?, ?, ?)",
                     (str(wallet.address), wallet.amount, str(wallet.user_id)),
@@ -50,6 +70,23 @@ class WalletRepository(IWalletRepository):
             ) from e
         return wallet
 
+    def get_wallets(self, addresses: Iterable[str]) -> List[Wallet]:
+        conn = ConnectionManager.get_connection()
+        addresses = list(addresses)
+        wallets: List[Wallet] = []
+        with closing(conn.cursor()) as cursor:
+            for start in range(0, len(addresses), QUERY_CHUNK_SIZE):
+                end = start + QUERY_CHUNK_SIZE
+                chunk = addresses[start:end]
+                cursor.execute(
+                    f"SELECT * FROM {WALLET_TABLE_NAME} "
+                    f"WHERE Address IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                cursor.row_factory = wallet_factory
+                wallets.extend(cursor.fetchall())
+        return wallets
+
     def get_user_wallets(self, user: User) -> List[Wallet]:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
@@ -57,16 +94,13 @@ class WalletRepository(IWalletRepository):
                 f"SELECT * FROM {WALLET_TABLE_NAME}" f" WHERE user_id = ?",
                 (str(user.user_id),),
             )
-            wallets = cursor.fetchall()
-
-            return [
-                Wallet(address=wallet[0], amount=wallet[1], user_id=UUID(wallet[2]))
-                for wallet in wallets
-            ]
+            cursor.row_factory = wallet_factory
+            wallets: List[Wallet] = cursor.fetchall()
+            return wallets
 
     def update_amount(self, address: str, amount: int) -> Wallet:
         conn = ConnectionManager.get_connection()
-        with closing(conn.cursor()) as cursor:
+        with ConnectionManager.atomic(), closing(conn.cursor()) as cursor:
             cursor.execute(
                 f"UPDATE {WALLET_TABLE_NAME} " f"SET amount = ? WHERE address = ?",
                 (
@@ -81,6 +115,39 @@ class WalletRepository(IWalletRepository):
 
         return self.get_wallet(address)
 
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        conn = ConnectionManager.get_connection()
+        with closing(conn.cursor()) as cursor:
+            cursor.execute(
+                f"UPDATE {WALLET_TABLE_NAME} SET Amount = Amount - ? "
+                f"WHERE Address = ? AND Amount >= ?",
+                (amount, from_address, required_balance),
+            )
+            if cursor.rowcount == 0:
+                self.get_wallet(from_address)
+                raise NotEnoughBalanceError("Not enough balance in the wallet.")
+
+            cursor.execute(
+                f"UPDATE {WALLET_TABLE_NAME} SET Amount = Amount + ? "
+                f"WHERE Address = ?",
+                (amount, to_address),
+            )
+            if cursor.rowcount == 0:
+                raise DoesNotExistError(f"Wallet with address {to_address} not found")
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        conn = ConnectionManager.get_connection()
+        with closing(conn.cursor()) as cursor:
+            cursor.executemany(
+                f"UPDATE {WALLET_TABLE_NAME} SET Amount = Amount + ? "
+                f"WHERE Address = ?",
+                [(change, address) for address, change in changes.items()],
+            )
+            if cursor.rowcount != len(changes):
+                raise DoesNotExistError("Some of the wallets do not exist")
+
     def tear_down(self) -> None:
         conn = ConnectionManager.get_connection()
         with closing(conn.cursor()) as cursor:
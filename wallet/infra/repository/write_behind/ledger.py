@@ -0,0 +1,293 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from uuid import UUID
+
+from wallet.core.entity.transaction import Transaction
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    NotEnoughBalanceError,
+    PersistenceError,
+)
+from wallet.infra.repository.repository_interface import (
+    ITransactionRepository,
+    IUnitOfWork,
+    IWalletRepository,
+)
+
+LEDGER_SUFFIX = "-ledger"
+DEFAULT_FLUSH_INTERVAL = 50
+
+logger = logging.getLogger(__name__)
+
+
+def to_record(transaction: Transaction) -> str:
+    return (
+        json.dumps(
+            [
+                str(transaction.transaction_id),
+                transaction.from_address,
+                transaction.to_address,
+                transaction.amount,
+                transaction.fee,
+            ]
+        )
+        + "\n"
+    )
+
+
+def from_record(record: str) -> Transaction:
+    transaction_id, from_address, to_address, amount, fee = json.loads(record)
+    return Transaction(from_address, to_address, amount, fee, UUID(transaction_id))
+
+
+def balance_changes(transactions: List[Transaction]) -> Dict[str, int]:
+    changes: Dict[str, int] = defaultdict(int)
+    for transaction in transactions:
+        changes[transaction.from_address] -= transaction.amount
+        changes[transaction.to_address] += transaction.amount
+    return changes
+
+
+class LedgerLog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "a+", encoding="utf-8")
+
+    def append(self, transactions: List[Transaction]) -> None:
+        self.file.write("".join(to_record(t) for t in transactions))
+        self.file.flush()
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def replay(self) -> List[Transaction]:
+        self.file.flush()
+        self.file.seek(0)
+        transactions = []
+        for record in self.file.read().splitlines():
+            try:
+                transactions.append(from_record(record))
+            except ValueError:
+                break
+        return transactions
+
+    def compact(self, transactions: List[Transaction]) -> None:
+        if not transactions:
+            self.truncate()
+            return
+
+        compacted = f"{self.path}.compact"
+        with open(compacted, "w", encoding="utf-8") as file:
+            file.write("".join(to_record(t) for t in transactions))
+            file.flush()
+            os.fsync(file.fileno())
+        self.file.close()
+        os.replace(compacted, self.path)
+        self.file = open(self.path, "a+", encoding="utf-8")
+
+    def truncate(self) -> None:
+        self.file.flush()
+        if self.file.tell() == 0:
+            return
+        self.file.truncate(0)
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self.file.close()
+
+
+class WriteBehindLedger:
+    def __init__(
+        self,
+        transaction_repository: ITransactionRepository,
+        wallet_repository: IWalletRepository,
+        unit_of_work: IUnitOfWork,
+        log: LedgerLog,
+        flush_interval: int = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.transaction_repository = transaction_repository
+        self.wallet_repository = wallet_repository
+        self.unit_of_work = unit_of_work
+        self.log = log
+        self.flush_interval = flush_interval
+        self.balances: Dict[str, int] = {}
+        self.pending: List[Transaction] = []
+        self.pending_ids: Set[UUID] = set()
+        self.undo: Optional[Dict[str, int]] = None
+        self.failure: Optional[Exception] = None
+        self.lock = threading.RLock()
+        self.flush_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        with self.lock:
+            self._check_failure()
+            if self.undo is not None:
+                yield
+                return
+
+            self.undo = {}
+            start = len(self.pending)
+            try:
+                yield
+                self.log.append(self.pending[start:])
+            except BaseException:
+                self.balances.update(self.undo)
+                self.pending_ids.difference_update(
+                    t.transaction_id for t in self.pending[start:]
+                )
+                del self.pending[start:]
+                raise
+            finally:
+                self.undo = None
+
+    def balance(self, address: str) -> int:
+        with self.lock:
+            if address not in self.balances:
+                wallet = self.wallet_repository.get_wallet(address)
+                self.balances[address] = wallet.amount
+            return self.balances[address]
+
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        with self.atomic():
+            self.balance(to_address)
+            if self.balance(from_address) < required_balance:
+                raise NotEnoughBalanceError("Not enough balance in the wallet.")
+            self._change(from_address, -amount)
+            self._change(to_address, amount)
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        with self.atomic():
+            for address in changes:
+                self.balance(address)
+            for address, change in changes.items():
+                self._change(address, change)
+
+    def append(self, transactions: List[Transaction]) -> None:
+        with self.atomic():
+            for transaction in transactions:
+                if transaction.transaction_id in self.pending_ids:
+                    raise AlreadyExistsError(
+                        f"Transaction with id {transaction.transaction_id} "
+                        "already exists"
+                    )
+                self.pending_ids.add(transaction.transaction_id)
+                self.pending.append(transaction)
+
+    def overwrite(self, address: str, write: Callable[[], object]) -> None:
+        with self.flush_lock, self.lock:
+            self._flush()
+            write()
+            self.balances.pop(address, None)
+
+    def flush(self) -> None:
+        with self.flush_lock:
+            self._flush()
+
+    def recover(self) -> int:
+        with self.flush_lock:
+            missing = self._unpersisted(self.log.replay())
+            if missing:
+                self._write(missing)
+            self.log.truncate()
+            return len(missing)
+
+    def start(self) -> None:
+        self.recover()
+        self.failure = None
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self._run, name="wallet-write-behind", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        try:
+            self.flush()
+        finally:
+            self.log.close()
+
+    def clear(self) -> None:
+        with self.flush_lock, self.lock:
+            self.balances = {}
+            self.pending = []
+            self.pending_ids = set()
+            self.log.truncate()
+
+    def _check_failure(self) -> None:
+        if self.failure is not None:
+            raise PersistenceError(
+                "Write-behind persistence failed, transfers stay in the ledger log"
+            ) from self.failure
+
+    def _flush(self) -> None:
+        self._check_failure()
+        try:
+            with self.lock:
+                batch = list(self.pending)
+                if batch:
+                    self.log.sync()
+            if batch:
+                self._persist(batch)
+        except Exception as err:
+            self.failure = err
+            raise
+
+        if not batch:
+            return
+
+        with self.lock:
+            self.pending_ids.difference_update(t.transaction_id for t in batch)
+            del self.pending[: len(batch)]
+            self.log.compact(self.pending)
+
+    def _change(self, address: str, change: int) -> None:
+        if self.undo is not None and address not in self.undo:
+            self.undo[address] = self.balances[address]
+        self.balances[address] += change
+
+    def _persist(self, batch: List[Transaction]) -> None:
+        try:
+            self._write(batch)
+        except AlreadyExistsError:
+            self._write(self._unpersisted(batch))
+
+    def _write(self, transactions: List[Transaction]) -> None:
+        with self.unit_of_work.atomic():
+            self.transaction_repository.create_transactions(transactions)
+            self.wallet_repository.apply_balance_changes(balance_changes(transactions))
+
+    def _unpersisted(self, transactions: List[Transaction]) -> List[Transaction]:
+        missing = []
+        for transaction in transactions:
+            try:
+                self.transaction_repository.get_transaction_by_id(
+                    transaction.transaction_id
+                )
+            except DoesNotExistError:
+                missing.append(transaction)
+        return missing
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.flush_interval / 1000):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed, stopping the worker")
+                return
@@ -0,0 +1,90 @@
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from wallet.core.entity.transaction import Transaction, TransactionPage
+from wallet.core.entity.user import User
+from wallet.core.entity.wallet import Wallet
+from wallet.infra.repository.repository_interface import (
+    TRANSACTION_BATCH_SIZE,
+    ITransactionRepository,
+)
+from wallet.infra.repository.write_behind.ledger import WriteBehindLedger
+
+
+class TransactionRepository(ITransactionRepository):
+    def __init__(
+        self, transaction_repository: ITransactionRepository, ledger: WriteBehindLedger
+    ) -> None:
+        self.transaction_repository = transaction_repository
+        self.ledger = ledger
+
+    def get_transaction_by_id(self, transaction_id: UUID) -> Transaction:
+        self.ledger.flush()
+        return self.transaction_repository.get_transaction_by_id(transaction_id)
+
+    def iter_transactions(
+        self, batch_size: int = TRANSACTION_BATCH_SIZE
+    ) -> Iterator[Transaction]:
+        self.ledger.flush()
+        yield from self.transaction_repository.iter_transactions(batch_size)
+
+    def get_transactions_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        self.ledger.flush()
+        return self.transaction_repository.get_transactions_page(limit, cursor)
+
+    def create_transaction(self, transaction: Transaction) -> Transaction:
+        self.ledger.append([transaction])
+        return transaction
+
+    def create_transactions(self, transactions: List[Transaction]) -> None:
+        self.ledger.append(transactions)
+
+    def filter_transactions(self, wallet: Wallet) -> List[Transaction]:
+        self.ledger.flush()
+        return self.transaction_repository.filter_transactions(wallet)
+
+    def get_user_transactions(self, user: User) -> List[Transaction]:
+        self.ledger.flush()
+        return self.transaction_repository.get_user_transactions(user)
+
+    def filter_transactions_page(
+        self, wallet: Wallet, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        self.ledger.flush()
+        return self.transaction_repository.filter_transactions_page(
+            wallet, limit, cursor
+        )
+
+    def get_user_transactions_page(
+        self, user: User, limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        self.ledger.flush()
+        return self.transaction_repository.get_user_transactions_page(
+            user, limit, cursor
+        )
+
+    def iter_wallet_transactions(self, wallet: Wallet) -> Iterator[Transaction]:
+        self.ledger.flush()
+        yield from self.transaction_repository.iter_wallet_transactions(wallet)
+
+    def iter_user_transactions(self, user: User) -> Iterator[Transaction]:
+        self.ledger.flush()
+        yield from self.transaction_repository.iter_user_transactions(user)
+
+    def get_transaction_count(self) -> int:
+        self.ledger.flush()
+        return self.transaction_repository.get_transaction_count()
+
+    def get_profit(self) -> int:
+        self.ledger.flush()
+        return self.transaction_repository.get_profit()
+
+    def reconcile_statistics(self) -> None:
+        self.ledger.flush()
+        self.transaction_repository.reconcile_statistics()
+
+    def tear_down(self) -> None:
+        self.ledger.clear()
+        self.transaction_repository.tear_down()
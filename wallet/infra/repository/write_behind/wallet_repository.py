@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, List
+
+from wallet.core.entity.user import User
+from wallet.core.entity.wallet import Wallet
+from wallet.infra.repository.repository_interface import IWalletRepository
+from wallet.infra.repository.write_behind.ledger import WriteBehindLedger
+
+
+class WalletRepository(IWalletRepository):
+    def __init__(
+        self, wallet_repository: IWalletRepository, ledger: WriteBehindLedger
+    ) -> None:
+        self.wallet_repository = wallet_repository
+        self.ledger = ledger
+
+    def get_wallet(self, address: str) -> Wallet:
+        return self._with_balance(self.wallet_repository.get_wallet(address))
+
+    def create_wallet(self, wallet: Wallet) -> Wallet:
+        return self.wallet_repository.create_wallet(wallet)
+
+    def get_wallets(self, addresses: Iterable[str]) -> List[Wallet]:
+        wallets = self.wallet_repository.get_wallets(addresses)
+        return [self._with_balance(wallet) for wallet in wallets]
+
+    def get_user_wallets(self, user: User) -> List[Wallet]:
+        wallets = self.wallet_repository.get_user_wallets(user)
+        return [self._with_balance(wallet) for wallet in wallets]
+
+    def update_amount(self, address: str, amount: int) -> Wallet:
+        self.ledger.overwrite(
+            address, lambda: self.wallet_repository.update_amount(address, amount)
+        )
+        return self.get_wallet(address)
+
+    def transfer(
+        self, from_address: str, to_address: str, amount: int, required_balance: int
+    ) -> None:
+        self.ledger.transfer(from_address, to_address, amount, required_balance)
+
+    def apply_balance_changes(self, changes: Dict[str, int]) -> None:
+        self.ledger.apply_balance_changes(changes)
+
+    def tear_down(self) -> None:
+        self.ledger.clear()
+        self.wallet_repository.tear_down()
+
+    def _with_balance(self, wallet: Wallet) -> Wallet:
+        return Wallet(
+            wallet.address, self.ledger.balance(wallet.address), wallet.user_id
+        )
@@ -1,13 +1,162 @@
 from __future__ import annotations
 
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
 import uvicorn
-from typer import Typer
+from typer import BadParameter, Option, Typer, echo
+
+from wallet.core.facade import IMPORT_CHUNK_SIZE, TransactionService, UserService
+from wallet.core.tool.calculator import (
+    DEFAULT_FEE_STRATEGY,
+    FEE_STRATEGIES,
+    load_fee_strategy,
+    percentage_fee_calculating_strategy,
+)
+from wallet.core.tool.user_parser import CSV_FORMAT, NDJSON_FORMAT, USER_PARSERS
+from wallet.infra.repository.sqlite.connection_manager import (
+    DURABILITY_MODES,
+    REQUEST_DURABILITY,
+)
+from wallet.infra.repository.sqlite.transaction_repository import TransactionRepository
+from wallet.infra.repository.sqlite.unit_of_work import UnitOfWork
+from wallet.infra.repository.sqlite.user_repository import UserRepository
+from wallet.infra.repository.sqlite.wallet_repository import WalletRepository
+from wallet.runner.reprice import REPRICE_CHUNK_SIZE, reprice
+from wallet.runner.setup import (
+    BACKEND_VARIABLE,
+    BACKENDS,
+    DATABASE_WORKERS_VARIABLE,
+    DEFAULT_DATABASE_WORKERS,
+    DURABILITY_VARIABLE,
+    FEE_STRATEGY_VARIABLE,
+    FEE_WORKERS_VARIABLE,
+    SQLITE_BACKEND,
+    destroy,
+)
 
-from wallet.runner.setup import setup
+APP_FACTORY = "wallet.runner.setup:create_app"
 
 cli = Typer(no_args_is_help=True, add_completion=False)
 
 
+def load_strategy(fee_strategy: str) -> Callable[[int], int]:
+    try:
+        return load_fee_strategy(fee_strategy)
+    except ValueError:
+        raise BadParameter(
+            f"Fee strategy must be one of {', '.join(FEE_STRATEGIES)} "
+            "or a module:name path to a strategy function"
+        )
+
+
 @cli.command()
-def run(host: str = "0.0.0.0", port: int = 8000) -> None:
-    uvicorn.run(host=host, port=port, app=setup())
+def run(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = Option(1, min=1),
+    durability: str = REQUEST_DURABILITY,
+    backend: str = SQLITE_BACKEND,
+    fee_workers: int = Option(0, min=0),
+    fee_strategy: str = DEFAULT_FEE_STRATEGY,
+    database_workers: int = Option(DEFAULT_DATABASE_WORKERS, min=1),
+) -> None:
+    if durability not in DURABILITY_MODES:
+        raise BadParameter(f"Durability must be one of {', '.join(DURABILITY_MODES)}")
+    if backend not in BACKENDS:
+        raise BadParameter(f"Backend must be one of {', '.join(BACKENDS)}")
+    if workers > 1 and backend != SQLITE_BACKEND:
+        raise BadParameter(f"The {backend} backend cannot be shared between workers")
+    load_strategy(fee_strategy)
+    os.environ[DURABILITY_VARIABLE] = durability
+    os.environ[BACKEND_VARIABLE] = backend
+    os.environ[FEE_WORKERS_VARIABLE] = str(fee_workers)
+    os.environ[FEE_STRATEGY_VARIABLE] = fee_strategy
+    os.environ[DATABASE_WORKERS_VARIABLE] = str(database_workers)
+    uvicorn.run(APP_FACTORY, factory=True, host=host, port=port, workers=workers)
+
+
+@cli.command()
+def reconcile_statistics() -> None:
+    service = TransactionService(
+        TransactionRepository(), WalletRepository(), UnitOfWork()
+    )
+    service.reconcile_statistics()
+    echo(
+        f"transaction_count: {service.get_transaction_count()}, "
+        f"profit: {service.get_profit()}"
+    )
+    destroy()
+
+
+@cli.command()
+def import_users(
+    path: Path,
+    file_format: Optional[str] = Option(None, "--format"),
+    chunk_size: int = Option(IMPORT_CHUNK_SIZE, min=1),
+) -> None:
+    if file_format is None:
+        file_format = CSV_FORMAT if path.suffix == ".csv" else NDJSON_FORMAT
+    if file_format not in USER_PARSERS:
+        raise BadParameter(f"Unknown format {file_format}")
+
+    parser = USER_PARSERS[file_format]()
+    service = UserService(UserRepository())
+    created = failed = 0
+    with path.open(newline="") as lines:
+        for result in service.import_users(parser.parse(lines), chunk_size):
+            if result.succeeded:
+                created += 1
+            else:
+                failed += 1
+            echo(
+                json.dumps(
+                    {
+                        "email": result.item.email,
+                        "api_key": result.item.api_key if result.succeeded else None,
+                        "error": None if result.error is None else str(result.error),
+                    }
+                )
+            )
+    echo(f"created: {created}, failed: {failed}", err=True)
+    destroy()
+
+
+@cli.command()
+def reprice_fees(
+    checkpoint: Path = Path("reprice-checkpoint.json"),
+    fee_strategy: str = DEFAULT_FEE_STRATEGY,
+    fee_percentage: Optional[float] = Option(None, min=0),
+    chunk_size: int = Option(REPRICE_CHUNK_SIZE, min=1),
+    restart: bool = False,
+) -> None:
+    if fee_percentage is not None:
+        fee_strategy = f"percentage:{fee_percentage}"
+        strategy = percentage_fee_calculating_strategy(fee_percentage)
+    else:
+        strategy = load_strategy(fee_strategy)
+    if restart:
+        checkpoint.unlink(missing_ok=True)
+
+    service = TransactionService(
+        TransactionRepository(), WalletRepository(), UnitOfWork()
+    )
+    try:
+        result = reprice(service, fee_strategy, strategy, checkpoint, chunk_size)
+    except ValueError as err:
+        raise BadParameter(str(err))
+    finally:
+        destroy()
+    echo(
+        json.dumps(
+            {
+                "fee_strategy": result.fee_strategy,
+                "transaction_count": result.transaction_count,
+                "profit": result.profit,
+                "repriced_profit": result.repriced_profit,
+                "difference": result.repriced_profit - result.profit,
+            }
+        )
+    )
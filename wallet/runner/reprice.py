@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from wallet.core.facade import TransactionService
+from wallet.core.tool.calculator import FeeCalculator
+
+REPRICE_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class RepriceCheckpoint:
+    fee_strategy: str
+    cursor: Optional[str] = None
+    transaction_count: int = 0
+    profit: int = 0
+    repriced_profit: int = 0
+    complete: bool = False
+
+    @staticmethod
+    def load(path: Path, fee_strategy: str) -> RepriceCheckpoint:
+        if not path.exists():
+            return RepriceCheckpoint(fee_strategy)
+
+        checkpoint = RepriceCheckpoint(**json.loads(path.read_text()))
+        if checkpoint.complete:
+            return RepriceCheckpoint(fee_strategy)
+        if checkpoint.fee_strategy != fee_strategy:
+            raise ValueError(
+                f"Checkpoint {path} was written for fee strategy "
+                f"{checkpoint.fee_strategy}"
+            )
+        return checkpoint
+
+    def save(self, path: Path) -> None:
+        temporary = path.with_name(path.name + ".tmp")
+        with temporary.open("w") as file:
+            json.dump(asdict(self), file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+
+def reprice(
+    service: TransactionService,
+    fee_strategy: str,
+    fee_calculating_strategy: Callable[[int], int],
+    checkpoint_path: Path,
+    chunk_size: int = REPRICE_CHUNK_SIZE,
+) -> RepriceCheckpoint:
+    checkpoint = RepriceCheckpoint.load(checkpoint_path, fee_strategy)
+    while not checkpoint.complete:
+        page = service.get_transactions_page(chunk_size, checkpoint.cursor)
+        amounts = array("q", (t.amount for t in page.transactions))
+        fees = FeeCalculator.calculate_fees(amounts, fee_calculating_strategy)
+        checkpoint.transaction_count += len(page.transactions)
+        checkpoint.profit += sum(t.fee for t in page.transactions)
+        checkpoint.repriced_profit += int(sum(fees))
+        checkpoint.cursor = page.next_cursor
+        checkpoint.complete = page.next_cursor is None
+        if not checkpoint.complete:
+            checkpoint.save(checkpoint_path)
+    checkpoint_path.unlink(missing_ok=True)
+    return checkpoint
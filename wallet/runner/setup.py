@@ -1,30 +1,244 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional, Union
+
 from fastapi import FastAPI
 
-from wallet.core.facade import TransactionService, UserService, WalletService
+from wallet.core.facade import (
+    AsyncTransactionService,
+    AsyncUserService,
+    AsyncWalletService,
+    TransactionService,
+    UserService,
+    WalletService,
+)
+from wallet.core.tool.cache import LRUCache
+from wallet.core.tool.calculator import DEFAULT_FEE_STRATEGY, load_fee_strategy
+from wallet.core.tool.converter import Converter
+from wallet.core.tool.rate_provider import (
+    BlockchainInfoFeed,
+    CachedRateProvider,
+    IRateFeed,
+)
 from wallet.infra.fastapi.statistics_api import statistics_api
 from wallet.infra.fastapi.transactions_api import transactions_api
 from wallet.infra.fastapi.users_api import users_api
 from wallet.infra.fastapi.wallets_api import wallet_api
-from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
+from wallet.infra.repository.memory.transaction_repository import (
+    TransactionRepository as InMemoryTransactionRepository,
+)
+from wallet.infra.repository.memory.unit_of_work import (
+    UnitOfWork as InMemoryUnitOfWork,
+)
+from wallet.infra.repository.memory.user_repository import (
+    UserRepository as InMemoryUserRepository,
+)
+from wallet.infra.repository.memory.wallet_repository import (
+    WalletRepository as InMemoryWalletRepository,
+)
+from wallet.infra.repository.repository_interface import (
+    ITransactionRepository,
+    IUnitOfWork,
+    IUserRepository,
+    IWalletRepository,
+)
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+from wallet.infra.repository.sharded.transaction_repository import (
+    TransactionRepository as ShardedTransactionRepository,
+)
+from wallet.infra.repository.sharded.unit_of_work import (
+    UnitOfWork as ShardedUnitOfWork,
+)
+from wallet.infra.repository.sharded.wallet_repository import (
+    WalletRepository as ShardedWalletRepository,
+)
+from wallet.infra.repository.sqlite.connection_manager import (
+    REQUEST_DURABILITY,
+    ConnectionManager,
+)
 from wallet.infra.repository.sqlite.transaction_repository import TransactionRepository
+from wallet.infra.repository.sqlite.unit_of_work import UnitOfWork
 from wallet.infra.repository.sqlite.user_repository import UserRepository
 from wallet.infra.repository.sqlite.wallet_repository import WalletRepository
+from wallet.infra.repository.write_behind.ledger import (
+    LEDGER_SUFFIX,
+    LedgerLog,
+    WriteBehindLedger,
+)
+from wallet.infra.repository.write_behind.transaction_repository import (
+    TransactionRepository as WriteBehindTransactionRepository,
+)
+from wallet.infra.repository.write_behind.unit_of_work import (
+    UnitOfWork as WriteBehindUnitOfWork,
+)
+from wallet.infra.repository.write_behind.wallet_repository import (
+    WalletRepository as WriteBehindWalletRepository,
+)
+
+DATABASE_EXECUTOR = "wallet-db"
+DEFAULT_DATABASE_WORKERS = 40
+DURABILITY_VARIABLE = "WALLET_DURABILITY"
+BACKEND_VARIABLE = "WALLET_BACKEND"
+DATABASE_WORKERS_VARIABLE = "WALLET_DATABASE_WORKERS"
+FEE_WORKERS_VARIABLE = "WALLET_FEE_WORKERS"
+FEE_STRATEGY_VARIABLE = "WALLET_FEE_STRATEGY"
+SQLITE_BACKEND = "sqlite"
+MEMORY_BACKEND = "memory"
+
+WRITE_BEHIND_BACKEND = "write-behind"
+SHARDED_BACKEND = "sharded"
+BACKENDS = (SQLITE_BACKEND, MEMORY_BACKEND, WRITE_BEHIND_BACKEND, SHARDED_BACKEND)
+
+
+class Repositories(NamedTuple):
+    user_repository: IUserRepository
+    wallet_repository: IWalletRepository
+    transaction_repository: ITransactionRepository
+    unit_of_work: IUnitOfWork
+    ledger: Optional[Union[WriteBehindLedger, ShardedLedger]] = None
 
 
-def setup() -> FastAPI:
-    api = FastAPI()
+class Services(NamedTuple):
+    user_service: UserService
+    wallet_service: WalletService
+    transaction_service: TransactionService
+
+
+@asynccontextmanager
+async def lifespan(api: FastAPI) -> AsyncIterator[None]:
+    services: Services = api.state.services
+    api.state.executor = ThreadPoolExecutor(
+        max_workers=api.state.database_workers, thread_name_prefix=DATABASE_EXECUTOR
+    )
+    api.state.fee_executor = (
+        ProcessPoolExecutor(
+            max_workers=api.state.fee_workers,
+            initializer=load_fee_strategy,
+            initargs=(services.transaction_service.fee_strategy,),
+        )
+        if api.state.fee_workers
+        else None
+    )
+    services.transaction_service.fee_executor = api.state.fee_executor
+    api.state.user_service = AsyncUserService(services.user_service, api.state.executor)
+    api.state.wallet_service = AsyncWalletService(
+        services.wallet_service, api.state.executor
+    )
+    api.state.transaction_service = AsyncTransactionService(
+        services.transaction_service, api.state.executor
+    )
+    api.state.rate_provider.start()
+    if api.state.ledger is not None:
+        api.state.ledger.start()
+    try:
+        yield
+    finally:
+        api.state.rate_provider.stop()
+        api.state.executor.shutdown(wait=True)
+        if api.state.fee_executor is not None:
+            api.state.fee_executor.shutdown(wait=True)
+            services.transaction_service.fee_executor = None
+        if api.state.ledger is not None:
+            api.state.ledger.stop()
+        destroy()
+
+
+def repositories(backend: str) -> Repositories:
+    if backend == SQLITE_BACKEND:
+        return Repositories(
+            UserRepository(),
+            WalletRepository(),
+            TransactionRepository(),
+            UnitOfWork(),
+        )
+    if backend == MEMORY_BACKEND:
+        wallet_repository = InMemoryWalletRepository()
+        return Repositories(
+            InMemoryUserRepository(),
+            wallet_repository,
+            InMemoryTransactionRepository(wallet_repository),
+            InMemoryUnitOfWork(wallet_repository.locks),
+        )
+    if backend == WRITE_BEHIND_BACKEND:
+        ledger = WriteBehindLedger(
+            TransactionRepository(),
+            WalletRepository(),
+            UnitOfWork(),
+            LedgerLog(ConnectionManager.database + LEDGER_SUFFIX),
+        )
+        return Repositories(
+            UserRepository(),
+            WriteBehindWalletRepository(WalletRepository(), ledger),
+            WriteBehindTransactionRepository(TransactionRepository(), ledger),
+            WriteBehindUnitOfWork(ledger),
+            ledger,
+        )
+    if backend == SHARDED_BACKEND:
+        sharded_ledger = ShardedLedger()
+        sharded_wallet_repository = ShardedWalletRepository(sharded_ledger)
+        return Repositories(
+            InMemoryUserRepository(),
+            sharded_wallet_repository,
+            ShardedTransactionRepository(sharded_ledger, sharded_wallet_repository),
+            ShardedUnitOfWork(sharded_ledger),
+            sharded_ledger,
+        )
+    raise ValueError(f"Unknown backend {backend}")
+
+
+def setup(
+    rate_feed: Optional[IRateFeed] = None,
+    backend: str = SQLITE_BACKEND,
+    fee_workers: int = 0,
+    fee_strategy: str = DEFAULT_FEE_STRATEGY,
+    database_workers: int = DEFAULT_DATABASE_WORKERS,
+) -> FastAPI:
+    load_fee_strategy(fee_strategy)
+    api = FastAPI(lifespan=lifespan)
     api.include_router(users_api, prefix="/users")
     api.include_router(wallet_api, prefix="/wallets")
     api.include_router(transactions_api, prefix="/transactions")
     api.include_router(statistics_api, prefix="/statistics")
 
-    api.state.user_service = UserService(UserRepository())
-    api.state.wallet_service = WalletService(WalletRepository())
-    api.state.transaction_service = TransactionService(
-        TransactionRepository(), WalletRepository()
+    (
+        user_repository,
+        wallet_repository,
+        transaction_repository,
+        unit_of_work,
+        api.state.ledger,
+    ) = repositories(backend)
+    api.state.database_workers = database_workers
+    api.state.fee_workers = fee_workers
+    api.state.api_key_cache = LRUCache()
+    api.state.services = Services(
+        UserService(user_repository, api_key_cache=api.state.api_key_cache),
+        WalletService(wallet_repository),
+        TransactionService(
+            transaction_repository,
+            wallet_repository,
+            unit_of_work,
+            fee_strategy=fee_strategy,
+        ),
     )
+    api.state.rate_provider = CachedRateProvider(rate_feed or BlockchainInfoFeed())
+    api.state.converter = Converter(api.state.rate_provider)
     return api
 
 
+def create_app() -> FastAPI:
+    ConnectionManager.configure(
+        durability=os.environ.get(DURABILITY_VARIABLE, REQUEST_DURABILITY)
+    )
+    return setup(
+        backend=os.environ.get(BACKEND_VARIABLE, SQLITE_BACKEND),
+        fee_workers=int(os.environ.get(FEE_WORKERS_VARIABLE, 0)),
+        fee_strategy=os.environ.get(FEE_STRATEGY_VARIABLE, DEFAULT_FEE_STRATEGY),
+        database_workers=int(
+            os.environ.get(DATABASE_WORKERS_VARIABLE, DEFAULT_DATABASE_WORKERS)
+        ),
+    )
+
+
 def destroy() -> None:
     ConnectionManager.close_all()
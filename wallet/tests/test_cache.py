@@ -0,0 +1,36 @@
+from wallet.core.tool.cache import LRUCache
+from wallet.tests.conftest import FakeClock
+
+
+def test_counts_hits_and_misses() -> None:
+    cache: LRUCache[str, int] = LRUCache()
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_expires_after_ttl(clock: FakeClock) -> None:
+    cache: LRUCache[str, int] = LRUCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 11
+    assert cache.get("a") is None
+    assert "a" not in cache.entries
+
+
+def test_invalidate() -> None:
+    cache: LRUCache[str, int] = LRUCache()
+    cache.put("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
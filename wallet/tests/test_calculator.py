@@ -0,0 +1,64 @@
+import random
+from array import array
+
+import pytest
+
+from wallet.core.tool import calculator
+from wallet.core.tool.calculator import (
+    DEFAULT_FEE_STRATEGY,
+    FeeCalculator,
+    default_fee_calculating_strategy,
+    load_fee_strategy,
+    percentage_fee_calculating_strategy,
+)
+
+RNG = random.Random(0)
+AMOUNTS = [0, 1, 66, 67, 133, 134, -1, -1_000, 2**53 + 1, 2**63 - 1, -(2**63)] + [
+    RNG.randrange(-(2**63), 2**63) for _ in range(1_000)
+]
+FEES = [default_fee_calculating_strategy(amount) for amount in AMOUNTS]
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_calculate_fees_matches_scalar_path(
+    vectorized: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if vectorized:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(calculator, "numpy", None)
+    assert list(FeeCalculator.calculate_fees(AMOUNTS)) == FEES
+    assert list(FeeCalculator.calculate_fees(array("q", AMOUNTS))) == FEES
+    assert list(FeeCalculator.calculate_fees(AMOUNTS, lambda amount: 7)) == [7] * len(
+        AMOUNTS
+    )
+
+
+def test_calculate_fees_keeps_numpy_arrays() -> None:
+    numpy = pytest.importorskip("numpy")
+    fees = FeeCalculator.calculate_fees(numpy.array(AMOUNTS, dtype=numpy.int64))
+    assert isinstance(fees, numpy.ndarray)
+    assert fees.tolist() == FEES
+
+
+def test_load_fee_strategy_imports_module_attribute(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(calculator, "FEE_STRATEGIES", dict(calculator.FEE_STRATEGIES))
+    name = "wallet.core.tool.calculator:default_fee_calculating_strategy"
+
+    assert load_fee_strategy(DEFAULT_FEE_STRATEGY) is default_fee_calculating_strategy
+    assert load_fee_strategy(name) is default_fee_calculating_strategy
+    assert calculator.FEE_STRATEGIES[name] is default_fee_calculating_strategy
+    for unknown in ["missing_module:strategy", "wallet.core.tool:missing", "missing"]:
+        with pytest.raises(ValueError):
+            load_fee_strategy(unknown)
+
+
+def test_percentage_strategy_is_registered_once_per_percentage() -> None:
+    strategy = percentage_fee_calculating_strategy(0.025)
+    registered = len(calculator.VECTORIZED_FEE_STRATEGIES)
+
+    assert percentage_fee_calculating_strategy(0.025) is strategy
+    assert len(calculator.VECTORIZED_FEE_STRATEGIES) == registered
+    assert strategy(1_000) == 25
@@ -0,0 +1,148 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from wallet.core.entity.wallet import WalletBuilder
+from wallet.core.error.errors import NotEnoughBalanceError
+from wallet.infra.repository.sqlite.connection_manager import (
+    GROUP_DURABILITY,
+    ConnectionManager,
+)
+from wallet.infra.repository.sqlite.wallet_repository import WalletRepository
+
+
+@pytest.fixture
+def file_database(tmp_path: Path) -> Iterator[None]:
+    in_mem, database = ConnectionManager.in_mem, ConnectionManager.database
+    ConnectionManager.set_in_mem(False)
+    ConnectionManager.set_database(str(tmp_path / "wallet.db"))
+    yield
+    ConnectionManager.close_all()
+    ConnectionManager.set_database(database)
+    ConnectionManager.set_in_mem(in_mem)
+
+
+@pytest.fixture
+def group_commit(file_database: None) -> Iterator[WalletRepository]:
+    ConnectionManager.set_foreign_keys(False)
+    ConnectionManager.configure(
+        durability=GROUP_DURABILITY,
+        group_commit_interval=60_000,
+        group_commit_writes=3,
+    )
+    yield WalletRepository()
+    ConnectionManager.close_all()
+    ConnectionManager.configure()
+
+
+def committed_wallets() -> int:
+    with sqlite3.connect(ConnectionManager.database) as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM wallets").fetchone()[0])
+
+
+def create_wallet(repository: WalletRepository, address: str) -> None:
+    repository.create_wallet(
+        WalletBuilder().builder().address(address).amount(100).build()
+    )
+
+
+def test_connection_per_thread(file_database: None) -> None:
+    connections: List[object] = []
+
+    def connect() -> None:
+        connections.append(ConnectionManager.get_connection())
+        connections.append(ConnectionManager.get_connection())
+
+    thread = threading.Thread(target=connect)
+    thread.start()
+    thread.join()
+    connect()
+
+    assert connections[0] is connections[1]
+    assert connections[2] is connections[3]
+    assert connections[0] is not connections[2]
+
+
+def test_connections_of_finished_threads_are_closed(file_database: None) -> None:
+    connections: List[sqlite3.Connection] = []
+
+    for _ in range(3):
+        thread = threading.Thread(
+            target=lambda: connections.append(ConnectionManager.get_connection())
+        )
+        thread.start()
+        thread.join()
+
+    assert connections[0] not in ConnectionManager.connections
+    assert connections[1] not in ConnectionManager.connections
+    assert connections[2] in ConnectionManager.connections
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+def test_pragmas_applied_on_connect(file_database: None) -> None:
+    ConnectionManager.configure(synchronous="FULL", busy_timeout=1234)
+    try:
+        conn = ConnectionManager.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    finally:
+        ConnectionManager.configure()
+
+
+def test_writes_visible_across_threads(file_database: None) -> None:
+    ConnectionManager.set_foreign_keys(False)
+    repository = WalletRepository()
+    repository.create_wallet(
+        WalletBuilder().builder().address("address_1").amount(100).build()
+    )
+    amounts: List[int] = []
+
+    thread = threading.Thread(
+        target=lambda: amounts.append(repository.get_wallet("address_1").amount)
+    )
+    thread.start()
+    thread.join()
+
+    assert amounts == [100]
+    repository.tear_down()
+
+
+def test_group_commit_after_n_writes(group_commit: WalletRepository) -> None:
+    create_wallet(group_commit, "address_1")
+    create_wallet(group_commit, "address_2")
+    assert committed_wallets() == 0
+    assert group_commit.get_wallet("address_2").amount == 100
+
+    create_wallet(group_commit, "address_3")
+    assert committed_wallets() == 3
+
+
+def test_group_commit_rolls_back_only_failed_unit(
+    group_commit: WalletRepository,
+) -> None:
+    create_wallet(group_commit, "address_1")
+    create_wallet(group_commit, "address_2")
+    with pytest.raises(NotEnoughBalanceError):
+        with ConnectionManager.atomic():
+            group_commit.transfer("address_1", "address_2", 10, 10)
+            group_commit.transfer("address_1", "address_2", 200, 200)
+
+    ConnectionManager.flush()
+    assert committed_wallets() == 2
+    assert group_commit.get_wallet("address_1").amount == 100
+    assert group_commit.get_wallet("address_2").amount == 100
+
+
+def test_group_commit_after_interval(group_commit: WalletRepository) -> None:
+    ConnectionManager.group_commit_interval = 10
+    create_wallet(group_commit, "address_1")
+    deadline = time.monotonic() + 5
+    while committed_wallets() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert committed_wallets() == 1
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from wallet.core.error.errors import ConversionError
+from wallet.core.tool.converter import BTC_TO_SATOSHI, Converter
+from wallet.core.tool.rate_provider import CachedRateProvider, IRateFeed, StubFeed
+from wallet.tests.conftest import FakeClock
+
+
+class FailingFeed(IRateFeed):
+    def fetch_btc_to_usd(self) -> float:
+        raise ConversionError("Ticker is down")
+
+
+@pytest.fixture
+def feed() -> StubFeed:
+    return StubFeed(40_000.0)
+
+
+@pytest.fixture
+def provider(feed: StubFeed, clock: FakeClock) -> CachedRateProvider:
+    return CachedRateProvider(feed, ttl=60, max_staleness=600, clock=clock)
+
+
+def test_converts_with_cached_rate(provider: CachedRateProvider) -> None:
+    provider.refresh()
+    converter = Converter(provider)
+    assert converter.btc_to_usd(0.5) == 20_000.0
+    assert converter.satoshi_to_usd(BTC_TO_SATOSHI) == 40_000.0
+
+
+def test_rate_not_available_before_first_fetch(provider: CachedRateProvider) -> None:
+    with pytest.raises(ConversionError):
+        provider.get_btc_to_usd()
+    assert provider.wake.is_set()
+
+
+def test_serves_stale_rate_while_revalidating(
+    provider: CachedRateProvider, feed: StubFeed, clock: FakeClock
+) -> None:
+    provider.refresh()
+    feed.rate = 50_000.0
+    clock.now = 61
+    assert provider.get_btc_to_usd() == 40_000.0
+    assert provider.wake.is_set()
+    provider.refresh()
+    assert provider.get_btc_to_usd() == 50_000.0
+
+
+def test_refuses_rate_older_than_max_staleness(
+    provider: CachedRateProvider, clock: FakeClock
+) -> None:
+    provider.refresh()
+    clock.now = 601
+    with pytest.raises(ConversionError):
+        provider.get_btc_to_usd()
+
+
+def test_failed_refresh_keeps_last_rate(clock: FakeClock) -> None:
+    provider = CachedRateProvider(StubFeed(40_000.0), clock=clock)
+    provider.refresh()
+    provider.feed = FailingFeed()
+    assert not provider.refresh()
+    assert provider.get_btc_to_usd() == 40_000.0
+
+
+class SlowFirstFetchFeed(IRateFeed):
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+
+    def fetch_btc_to_usd(self) -> float:
+        self.calls += 1
+        if self.calls == 1:
+            self.release.wait(5)
+            raise ConversionError("Ticker is down")
+        return 40_000.0
+
+
+def wait_for_rate(provider: CachedRateProvider) -> float:
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            return provider.get_btc_to_usd()
+        except ConversionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def test_background_refresher_starts_and_stops(provider: CachedRateProvider) -> None:
+    provider.start()
+    assert wait_for_rate(provider) == 40_000.0
+    provider.stop()
+    assert provider.thread is None
+
+
+def test_start_does_not_wait_for_the_first_fetch() -> None:
+    feed = SlowFirstFetchFeed()
+    provider = CachedRateProvider(feed, min_refresh_interval=0.01)
+    provider.start()
+    with pytest.raises(ConversionError):
+        provider.get_btc_to_usd()
+
+    feed.release.set()
+    assert wait_for_rate(provider) == 40_000.0
+    provider.stop()
@@ -0,0 +1,97 @@
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import pytest
+
+from wallet.core.entity.transaction import TransactionBuilder, TransactionPage
+from wallet.core.entity.user import UserBuilder
+from wallet.core.entity.wallet import Wallet
+from wallet.core.facade import TransactionService
+from wallet.core.tool.calculator import (
+    default_fee_calculating_strategy,
+    percentage_fee_calculating_strategy,
+)
+from wallet.infra.repository.memory.transaction_repository import (
+    TransactionRepository,
+)
+from wallet.infra.repository.memory.unit_of_work import UnitOfWork
+from wallet.infra.repository.memory.wallet_repository import WalletRepository
+from wallet.runner.reprice import RepriceCheckpoint, reprice
+
+AMOUNTS = [10, 100, 1_000, 10_000, 100_000, 1_000_000, 7]
+
+
+@pytest.fixture
+def service() -> TransactionService:
+    wallet_repository = WalletRepository()
+    service = TransactionService(
+        TransactionRepository(wallet_repository),
+        wallet_repository,
+        UnitOfWork(wallet_repository.locks),
+    )
+    wallet_repository.create_wallet(Wallet("address_1", 10_000_000, uuid4()))
+    wallet_repository.create_wallet(Wallet("address_2", 0, uuid4()))
+    sender = UserBuilder().builder().build()
+    for amount in AMOUNTS:
+        transaction = (
+            TransactionBuilder()
+            .builder()
+            .from_address("address_1")
+            .to_address("address_2")
+            .amount(amount)
+            .build()
+        )
+        service.create_transaction(transaction, sender, False)
+    return service
+
+
+def test_reprice(service: TransactionService, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "c.json"
+    strategy = percentage_fee_calculating_strategy(0.02)
+    result = reprice(service, "percentage:0.02", strategy, checkpoint, 3)
+    assert result.complete
+    assert result.transaction_count == len(AMOUNTS)
+    assert result.profit == service.get_profit()
+    assert result.repriced_profit == sum(max(int(a * 0.02), 1) for a in AMOUNTS)
+    assert not checkpoint.exists()
+
+    RepriceCheckpoint("percentage:0.02", None, 1, 2, 3, True).save(checkpoint)
+    rerun = reprice(service, "default", default_fee_calculating_strategy, checkpoint, 3)
+    assert rerun.transaction_count == len(AMOUNTS)
+    assert rerun.repriced_profit == rerun.profit == service.get_profit()
+
+
+def test_reprice_resumes_from_checkpoint(
+    service: TransactionService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    checkpoint = tmp_path / "checkpoint.json"
+    get_transactions_page = service.get_transactions_page
+    cursors = []
+
+    def interrupted(limit: int, cursor: Optional[str] = None) -> TransactionPage:
+        cursors.append(cursor)
+        if len(cursors) == 2:
+            raise KeyboardInterrupt
+        return get_transactions_page(limit, cursor)
+
+    monkeypatch.setattr(service, "get_transactions_page", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        reprice(service, "default", default_fee_calculating_strategy, checkpoint, 3)
+    saved = RepriceCheckpoint.load(checkpoint, "default")
+    assert saved.transaction_count == 3 and not saved.complete
+    with pytest.raises(ValueError):
+        reprice(
+            service,
+            "percentage:0.02",
+            percentage_fee_calculating_strategy(0.02),
+            checkpoint,
+            3,
+        )
+
+    result = reprice(
+        service, "default", default_fee_calculating_strategy, checkpoint, 3
+    )
+    assert cursors[2] == saved.cursor
+    assert result.transaction_count == len(AMOUNTS)
+    assert result.repriced_profit == result.profit == service.get_profit()
@@ -0,0 +1,171 @@
+import random
+import threading
+from typing import Iterator, List
+from uuid import uuid4
+
+import pytest
+
+from wallet.core.entity.transaction import Transaction, TransactionBuilder
+from wallet.core.entity.wallet import Wallet
+from wallet.core.error.errors import DoesNotExistError, NotEnoughBalanceError
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+
+
+@pytest.fixture
+def ledger() -> Iterator[ShardedLedger]:
+    ledger = ShardedLedger(4)
+    ledger.start()
+    yield ledger
+    ledger.stop()
+
+
+def addresses_on_shards(ledger: ShardedLedger, count: int) -> List[str]:
+    addresses: List[str] = []
+    while len(addresses) < count:
+        address = str(uuid4())
+        if ledger.shard(address) not in {ledger.shard(a) for a in addresses}:
+            addresses.append(address)
+    return addresses
+
+
+def test_cross_shard_transfer_is_aborted_on_missing_receiver(
+    ledger: ShardedLedger,
+) -> None:
+    sender, receiver = addresses_on_shards(ledger, 2)
+    ledger.create_wallet(Wallet(sender, 100, uuid4()))
+
+    with pytest.raises(DoesNotExistError):
+        ledger.transfer(sender, receiver, 50, 51)
+    assert ledger.get_wallet(sender).amount == 100
+
+    ledger.create_wallet(Wallet(receiver, 0, uuid4()))
+    with pytest.raises(NotEnoughBalanceError):
+        ledger.transfer(sender, receiver, 100, 101)
+    ledger.transfer(sender, receiver, 50, 51)
+    assert ledger.get_wallet(sender).amount == 50
+    assert ledger.get_wallet(receiver).amount == 50
+
+
+def test_cross_shard_balance_changes_are_all_or_nothing(
+    ledger: ShardedLedger,
+) -> None:
+    first, second, missing = addresses_on_shards(ledger, 3)
+    ledger.create_wallet(Wallet(first, 100, uuid4()))
+    ledger.create_wallet(Wallet(second, 100, uuid4()))
+
+    with pytest.raises(DoesNotExistError):
+        ledger.apply_balance_changes({first: -10, second: 5, missing: 5})
+    assert ledger.get_wallet(first).amount == 100
+    assert ledger.get_wallet(second).amount == 100
+
+
+def test_concurrent_cross_shard_transfers_conserve_supply(
+    ledger: ShardedLedger,
+) -> None:
+    addresses = [f"shard_{i}" for i in range(32)]
+    for address in addresses:
+        ledger.create_wallet(Wallet(address, 1_000, uuid4()))
+
+    def transfer(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(300):
+            from_address, to_address = rng.sample(addresses, 2)
+            amount = rng.randint(1, 200)
+            try:
+                ledger.transfer(from_address, to_address, amount, amount)
+            except NotEnoughBalanceError:
+                pass
+
+    threads = [threading.Thread(target=transfer, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    balances = [ledger.get_wallet(a).amount for a in addresses]
+    assert sum(balances) == 32_000
+    assert all(balance >= 0 for balance in balances)
+
+
+def test_shard_rejects_requests_before_start() -> None:
+    ledger = ShardedLedger(2)
+
+    with pytest.raises(RuntimeError):
+        ledger.create_wallet(Wallet("address_1", 100, uuid4()))
+
+
+def test_cross_shard_balance_changes_cannot_overdraw(ledger: ShardedLedger) -> None:
+    first, second = addresses_on_shards(ledger, 2)
+    ledger.create_wallet(Wallet(first, 100, uuid4()))
+    ledger.create_wallet(Wallet(second, 100, uuid4()))
+
+    with pytest.raises(NotEnoughBalanceError):
+        ledger.apply_balance_changes({first: -50, second: -150})
+    assert ledger.get_wallet(first).amount == 100
+    assert ledger.get_wallet(second).amount == 100
+
+
+def test_transactions_are_stored_when_the_unit_commits(ledger: ShardedLedger) -> None:
+    transaction = (
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address("address_2")
+        .amount(10)
+        .build()
+    )
+
+    with pytest.raises(NotEnoughBalanceError):
+        with ledger.atomic():
+            ledger.create_transaction(transaction)
+            raise NotEnoughBalanceError("Not enough balance in the wallet.")
+    assert ledger.get_transaction_count() == 0
+
+    with ledger.atomic():
+        ledger.create_transaction(transaction)
+        assert ledger.get_transaction_count() == 0
+    assert ledger.get_transaction_by_id(transaction.transaction_id) is transaction
+
+
+def test_pages_do_not_skip_transactions_indexed_late(
+    ledger: ShardedLedger, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first, second = [
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address("address_2")
+        .amount(10)
+        .build()
+        for _ in range(2)
+    ]
+    index = ledger._index
+    indexing = threading.Event()
+    release = threading.Event()
+
+    def index_late(transactions: List[Transaction]) -> None:
+        if transactions == [first]:
+            indexing.set()
+            release.wait(5)
+        index(transactions)
+
+    monkeypatch.setattr(ledger, "_index", index_late)
+    writers = [
+        threading.Thread(target=ledger.create_transaction, args=(transaction,))
+        for transaction in (first, second)
+    ]
+    writers[0].start()
+    indexing.wait(5)
+    writers[1].start()
+    writers[1].join(0.1)
+
+    seen = ledger.transactions_after("address_1", 0, 2)
+    release.set()
+    for writer in writers:
+        writer.join()
+    position = ledger.position(seen[-1]) if seen else 0
+    seen += ledger.transactions_after("address_1", position, 2)
+    assert {t.transaction_id for t in seen} == {
+        first.transaction_id,
+        second.transaction_id,
+    }
@@ -1,31 +1,88 @@
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterator
 from uuid import uuid4
 
 import pytest
 
+from wallet.core import facade
 from wallet.core.entity.transaction import TransactionBuilder
+from wallet.core.entity.user import UserBuilder
 from wallet.core.entity.wallet import Wallet, WalletBuilder
-from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    InvalidCursorError,
+    NotEnoughBalanceError,
+    WrongOwnerError,
+)
 from wallet.core.facade import TransactionService
+from wallet.core.tool.calculator import load_fee_strategy
 from wallet.infra.repository.memory.transaction_repository import (
     TransactionRepository as InMemoryTransactionRepository,
 )
+from wallet.infra.repository.memory.unit_of_work import (
+    UnitOfWork as InMemoryUnitOfWork,
+)
 from wallet.infra.repository.memory.wallet_repository import (
     WalletRepository as InMemoryWalletRepository,
 )
-from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+from wallet.infra.repository.sharded.transaction_repository import (
+    TransactionRepository as ShardedTransactionRepository,
+)
+from wallet.infra.repository.sharded.unit_of_work import (
+    UnitOfWork as ShardedUnitOfWork,
+)
+from wallet.infra.repository.sharded.wallet_repository import (
+    WalletRepository as ShardedWalletRepository,
+)
+from wallet.infra.repository.sqlite.connection_manager import (
+    GROUP_DURABILITY,
+    REQUEST_DURABILITY,
+    ConnectionManager,
+)
 from wallet.infra.repository.sqlite.transaction_repository import (
+    STATISTICS_TABLE_NAME,
     TransactionRepository as SQLiteTransactionRepository,
 )
+from wallet.infra.repository.sqlite.unit_of_work import UnitOfWork as SQLiteUnitOfWork
 from wallet.infra.repository.sqlite.wallet_repository import (
     WalletRepository as SQLiteWalletRepository,
 )
 
+FLAT_FEE_STRATEGY = f"{__name__}:flat_fee"
+
+
+def flat_fee(amount: int) -> int:
+    return 5
+
+
+def skew_statistics(service: TransactionService) -> None:
+    repository = service.transaction_repository
+    if isinstance(repository, SQLiteTransactionRepository):
+        ConnectionManager.get_connection().execute(
+            f"UPDATE {STATISTICS_TABLE_NAME} SET Transaction_Count = 7, Profit = 70"
+        )
+    elif isinstance(repository, ShardedTransactionRepository):
+        for shard in repository.ledger.shards:
+            shard.transaction_count, shard.profit = 7, 70
+    else:
+        assert isinstance(repository, InMemoryTransactionRepository)
+        repository.transaction_count, repository.profit = 7, 70
+
 
 @pytest.fixture
 def service_in_mem_dict() -> TransactionService:
+    wallet_repository = InMemoryWalletRepository()
     ts = TransactionService(
-        InMemoryTransactionRepository(),
-        InMemoryWalletRepository(),
+        InMemoryTransactionRepository(wallet_repository),
+        wallet_repository,
+        InMemoryUnitOfWork(wallet_repository.locks),
     )
     ts.wallet_repository.create_wallet(Wallet("address_1", 100, uuid4()))
     ts.wallet_repository.create_wallet(Wallet("address_2", 200, uuid4()))
@@ -34,18 +91,71 @@ def service_in_mem_dict() -> TransactionService:
 
 
 @pytest.fixture
-def service_in_mem_sqlite() -> TransactionService:
+def service_in_mem_sqlite() -> Iterator[TransactionService]:
+    in_mem = ConnectionManager.in_mem
     ConnectionManager.set_foreign_keys(False)
     ConnectionManager.set_in_mem(True)
-    ts = TransactionService(SQLiteTransactionRepository(), SQLiteWalletRepository())
+    ts = TransactionService(
+        SQLiteTransactionRepository(), SQLiteWalletRepository(), SQLiteUnitOfWork()
+    )
     ts.wallet_repository.create_wallet(Wallet("address_1", 100, uuid4()))
     ts.wallet_repository.create_wallet(Wallet("address_2", 200, uuid4()))
     ts.wallet_repository.create_wallet(Wallet("address_3", 300, uuid4()))
-    return ts
+    yield ts
+    ConnectionManager.set_in_mem(in_mem)
+
+
+@contextmanager
+def file_sqlite_service(durability: str, path: Path) -> Iterator[TransactionService]:
+    in_mem, database = ConnectionManager.in_mem, ConnectionManager.database
+    ConnectionManager.set_foreign_keys(False)
+    ConnectionManager.set_in_mem(False)
+    ConnectionManager.set_database(str(path))
+    ConnectionManager.configure(durability=durability)
+    ts = TransactionService(
+        SQLiteTransactionRepository(), SQLiteWalletRepository(), SQLiteUnitOfWork()
+    )
+    ts.wallet_repository.create_wallet(Wallet("address_1", 100, uuid4()))
+    ts.wallet_repository.create_wallet(Wallet("address_2", 200, uuid4()))
+    ts.wallet_repository.create_wallet(Wallet("address_3", 300, uuid4()))
+    yield ts
+    ConnectionManager.close_all()
+    ConnectionManager.configure()
+    ConnectionManager.set_database(database)
+    ConnectionManager.set_in_mem(in_mem)
+
+
+@pytest.fixture
+def service_file_sqlite(tmp_path: Path) -> Iterator[TransactionService]:
+    with file_sqlite_service(REQUEST_DURABILITY, tmp_path / "wallet.db") as ts:
+        yield ts
+
+
+@pytest.fixture
+def service_file_sqlite_group(tmp_path: Path) -> Iterator[TransactionService]:
+    with file_sqlite_service(GROUP_DURABILITY, tmp_path / "wallet.db") as ts:
+        yield ts
+
+
+@pytest.fixture
+def service_sharded() -> Iterator[TransactionService]:
+    ledger = ShardedLedger(4)
+    ledger.start()
+    wallet_repository = ShardedWalletRepository(ledger)
+    ts = TransactionService(
+        ShardedTransactionRepository(ledger, wallet_repository),
+        wallet_repository,
+        ShardedUnitOfWork(ledger),
+    )
+    ts.wallet_repository.create_wallet(Wallet("address_1", 100, uuid4()))
+    ts.wallet_repository.create_wallet(Wallet("address_2", 200, uuid4()))
+    ts.wallet_repository.create_wallet(Wallet("address_3", 300, uuid4()))
+    yield ts
+    ledger.stop()
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_create_transaction(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -67,7 +177,270 @@ def test_create_transaction(service_name: str, request: pytest.FixtureRequest) -
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_not_enough_balance(service_name: str, request: pytest.FixtureRequest) -> None:
+    service = request.getfixturevalue(service_name)
+    transaction = (
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address("address_2")
+        .amount(100)
+        .build()
+    )
+    with pytest.raises(NotEnoughBalanceError):
+        service.create_transaction(transaction, None, False)
+    assert service.wallet_repository.get_wallet("address_1").amount == 100
+    assert service.wallet_repository.get_wallet("address_2").amount == 200
+    assert service.get_transaction_count() == 0
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_transfer_to_missing_wallet_is_rolled_back(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    transaction = (
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address("address_4")
+        .amount(50)
+        .build()
+    )
+    with pytest.raises(DoesNotExistError):
+        service.create_transaction(transaction, None, False)
+    assert service.wallet_repository.get_wallet("address_1").amount == 100
+    assert service.get_transaction_count() == 0
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name",
+    [
+        "service_in_mem_dict",
+        "service_in_mem_sqlite",
+        "service_file_sqlite",
+        "service_file_sqlite_group",
+        "service_sharded",
+    ],
+)
+def test_concurrent_transactions_conserve_balance(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    addresses = ["address_1", "address_2", "address_3"]
+    succeeded = []
+    rejected = []
+
+    def transfer(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(200):
+            from_address, to_address = rng.sample(addresses, 2)
+            transaction = (
+                TransactionBuilder()
+                .builder()
+                .from_address(from_address)
+                .to_address(to_address)
+                .amount(rng.randint(1, 60))
+                .build()
+            )
+            try:
+                service.create_transaction(transaction, None, False)
+                succeeded.append(transaction)
+            except NotEnoughBalanceError:
+                rejected.append(transaction)
+
+    threads = [threading.Thread(target=transfer, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(succeeded) + len(rejected) == 8 * 200
+    balances = [service.wallet_repository.get_wallet(a).amount for a in addresses]
+    assert sum(balances) == 600
+    assert all(balance >= 0 for balance in balances)
+    assert service.get_transaction_count() == len(succeeded)
+    service.tear_down()
+
+
+@pytest.mark.parametrize("service_name", ["service_in_mem_dict", "service_sharded"])
+def test_mixed_transfers_conserve_supply_under_stress(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    wallet_repository = service.wallet_repository
+    addresses = [f"stress_{i}" for i in range(32)]
+    for address in addresses:
+        wallet_repository.create_wallet(Wallet(address, 1_000, uuid4()))
+    sender = UserBuilder().builder().email("stress@example.com").build()
+    succeeded = []
+
+    def transfer(seed: int) -> None:
+        rng = random.Random(seed)
+        for i in range(300):
+            transactions = [
+                TransactionBuilder()
+                .builder()
+                .from_address(from_address)
+                .to_address(to_address)
+                .amount(rng.randint(1, 200))
+                .build()
+                for from_address, to_address in (
+                    rng.sample(addresses, 2) for _ in range(1 + i % 3)
+                )
+            ]
+            if len(transactions) == 1:
+                try:
+                    service.create_transaction(transactions[0], sender, False)
+                    succeeded.append(transactions[0])
+                except NotEnoughBalanceError:
+                    pass
+            else:
+                try:
+                    results = service.create_transactions_bulk(
+                        transactions, sender, False
+                    )
+                    succeeded.extend(r.item for r in results if r.succeeded)
+                except NotEnoughBalanceError:
+                    pass
+
+    threads = [threading.Thread(target=transfer, args=(seed,)) for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    balances = [wallet_repository.get_wallet(a).amount for a in addresses]
+    assert sum(balances) == 32_000
+    assert all(balance >= 0 for balance in balances)
+    assert service.get_transaction_count() == len(succeeded)
+    assert service.get_profit() == sum(t.fee for t in succeeded)
+    service.tear_down()
+
+
+def test_striped_locks_let_independent_transfers_proceed() -> None:
+    wallet_repository = InMemoryWalletRepository()
+    service = TransactionService(
+        InMemoryTransactionRepository(wallet_repository),
+        wallet_repository,
+        InMemoryUnitOfWork(wallet_repository.locks),
+    )
+    addresses = [f"parallel_{i}" for i in range(4)]
+    while len(set(wallet_repository.locks.stripes(addresses))) < 4:
+        addresses = [f"parallel_{uuid4()}" for _ in range(4)]
+    for address in addresses:
+        wallet_repository.create_wallet(Wallet(address, 100, uuid4()))
+    transaction = (
+        TransactionBuilder()
+        .builder()
+        .from_address(addresses[2])
+        .to_address(addresses[3])
+        .amount(10)
+        .build()
+    )
+
+    with service.unit_of_work.atomic(addresses[:2]):
+        thread = threading.Thread(
+            target=service.create_transaction, args=(transaction, None, False)
+        )
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    assert wallet_repository.get_wallet(addresses[3]).amount == 110
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_create_transactions_bulk(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    user = UserBuilder().builder().email("user@example.com").build()
+    service.wallet_repository.create_wallet(Wallet("address_4", 100, user.user_id))
+    service.wallet_repository.create_wallet(Wallet("address_5", 100, user.user_id))
+    transactions = [
+        TransactionBuilder()
+        .builder()
+        .from_address(from_address)
+        .to_address(to_address)
+        .amount(amount)
+        .build()
+        for from_address, to_address, amount in [
+            ("address_4", "address_1", 60),
+            ("address_4", "address_2", 60),
+            ("address_5", "address_4", 50),
+            ("address_4", "address_2", 60),
+            ("address_1", "address_2", 10),
+            ("address_5", "address_6", 10),
+        ]
+    ]
+    results = service.create_transactions_bulk(transactions, user)
+    assert [result.succeeded for result in results] == [
+        True,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert isinstance(results[1].error, NotEnoughBalanceError)
+    assert isinstance(results[4].error, WrongOwnerError)
+    assert isinstance(results[5].error, DoesNotExistError)
+    assert service.wallet_repository.get_wallet("address_4").amount == 30
+    assert service.wallet_repository.get_wallet("address_5").amount == 50
+    assert service.wallet_repository.get_wallet("address_1").amount == 160
+    assert service.wallet_repository.get_wallet("address_2").amount == 260
+    assert service.get_transaction_count() == 3
+    service.tear_down()
+
+
+def test_create_transactions_bulk_with_fee_processes(
+    service_in_mem_dict: TransactionService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(facade, "FEE_CHUNK_SIZE", 2)
+    transactions = [
+        TransactionBuilder()
+        .builder()
+        .from_address("address_3")
+        .to_address("address_1")
+        .amount(amount)
+        .build()
+        for amount in [10, 20, 30, 40, 300]
+    ]
+    user = UserBuilder().builder().build()
+    load_fee_strategy(FLAT_FEE_STRATEGY)
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=get_context("spawn"),
+        initializer=load_fee_strategy,
+        initargs=(FLAT_FEE_STRATEGY,),
+    ) as executor:
+        service_in_mem_dict.fee_strategy = FLAT_FEE_STRATEGY
+        service_in_mem_dict.fee_executor = executor
+        results = service_in_mem_dict.create_transactions_bulk(
+            transactions, user, False
+        )
+    assert [result.succeeded for result in results] == [True] * 4 + [False]
+    assert [t.fee for t in transactions] == [5] * 5
+    assert service_in_mem_dict.wallet_repository.get_wallet("address_3").amount == 200
+    assert service_in_mem_dict.get_profit() == 20
+
+    service_in_mem_dict.fee_strategy = "unknown"
+    service_in_mem_dict.fee_executor = None
+    with pytest.raises(ValueError):
+        service_in_mem_dict.create_transactions_bulk(transactions, user, False)
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_transaction(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -82,11 +455,13 @@ def test_get_transaction(service_name: str, request: pytest.FixtureRequest) -> N
     service.create_transaction(transaction, None, False)
     retrieved_transaction = service.get_transaction_by_id(transaction.transaction_id)
     assert retrieved_transaction.amount == transaction.amount
+    assert retrieved_transaction.from_address == transaction.from_address
+    assert retrieved_transaction.to_address == transaction.to_address
     service.tear_down()
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_not_found_transaction(
     service_name: str, request: pytest.FixtureRequest
@@ -98,7 +473,7 @@ def test_not_found_transaction(
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_already_exists_transaction(
     service_name: str, request: pytest.FixtureRequest
@@ -119,7 +494,7 @@ def test_already_exists_transaction(
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_filter_transactions(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -161,7 +536,147 @@ def test_filter_transactions(service_name: str, request: pytest.FixtureRequest)
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_get_user_transactions(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    user = UserBuilder().builder().email("user@example.com").build()
+    service.wallet_repository.create_wallet(Wallet("address_4", 400, user.user_id))
+    service.wallet_repository.create_wallet(Wallet("address_5", 500, user.user_id))
+    for from_address, to_address in [
+        ("address_4", "address_5"),
+        ("address_1", "address_4"),
+        ("address_5", "address_2"),
+        ("address_2", "address_3"),
+    ]:
+        transaction = (
+            TransactionBuilder()
+            .builder()
+            .from_address(from_address)
+            .to_address(to_address)
+            .amount(10)
+            .build()
+        )
+        service.create_transaction(transaction, None, False)
+    user_transactions = service.get_user_transactions(user)
+    assert len(user_transactions) == 3
+    assert len({t.transaction_id for t in user_transactions}) == 3
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_transaction_pages(service_name: str, request: pytest.FixtureRequest) -> None:
+    service = request.getfixturevalue(service_name)
+    user = UserBuilder().builder().email("user@example.com").build()
+    service.wallet_repository.create_wallet(Wallet("address_4", 400, user.user_id))
+    service.wallet_repository.create_wallet(Wallet("address_5", 500, user.user_id))
+    created = []
+    for from_address, to_address in [
+        ("address_4", "address_5"),
+        ("address_1", "address_4"),
+        ("address_2", "address_3"),
+        ("address_5", "address_2"),
+        ("address_4", "address_1"),
+    ]:
+        transaction = (
+            TransactionBuilder()
+            .builder()
+            .from_address(from_address)
+            .to_address(to_address)
+            .amount(10)
+            .build()
+        )
+        created.append(service.create_transaction(transaction, None, False))
+
+    wallet = WalletBuilder().builder().address("address_4").build()
+    page = service.filter_transactions_page(wallet, 2)
+    assert [t.amount for t in page.transactions] == [10, 10]
+    assert page.next_cursor is not None
+    last_page = service.filter_transactions_page(wallet, 2, page.next_cursor)
+    assert len(last_page.transactions) == 1
+    assert last_page.next_cursor is None
+
+    seen: list[str] = []
+    cursor: str | None = None
+    while True:
+        page = service.get_user_transactions_page(user, 1, cursor)
+        seen.extend(str(t.transaction_id) for t in page.transactions)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    expected = [str(created[i].transaction_id) for i in (0, 1, 3, 4)]
+    assert seen == expected
+    assert [str(t.transaction_id) for t in service.iter_user_transactions(user)] == (
+        expected
+    )
+    assert len(list(service.iter_wallet_transactions(wallet))) == 3
+
+    seen = []
+    cursor = None
+    while True:
+        page = service.get_transactions_page(2, cursor)
+        seen.extend(str(t.transaction_id) for t in page.transactions)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [str(t.transaction_id) for t in created]
+    service.tear_down()
+
+
+def test_sqlite_user_pages_do_not_sort(
+    service_in_mem_sqlite: TransactionService,
+) -> None:
+    service = service_in_mem_sqlite
+    user = UserBuilder().builder().email("user@example.com").build()
+    service.wallet_repository.create_wallet(Wallet("address_4", 400, user.user_id))
+    service.wallet_repository.create_wallet(Wallet("address_5", 500, user.user_id))
+    for from_address, to_address in [
+        ("address_4", "address_5"),
+        ("address_1", "address_4"),
+        ("address_5", "address_2"),
+    ]:
+        transaction = (
+            TransactionBuilder()
+            .builder()
+            .from_address(from_address)
+            .to_address(to_address)
+            .amount(10)
+            .build()
+        )
+        service.create_transaction(transaction, user, False)
+
+    conn = ConnectionManager.get_connection()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        page = service.get_user_transactions_page(user, 2)
+    finally:
+        conn.set_trace_callback(None)
+    assert len(page.transactions) == 2
+    assert statements
+    for statement in statements:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        assert not any("TEMP B-TREE" in row[-1] for row in plan)
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_invalid_cursor(service_name: str, request: pytest.FixtureRequest) -> None:
+    service = request.getfixturevalue(service_name)
+    wallet = WalletBuilder().builder().address("address_1").build()
+    with pytest.raises(InvalidCursorError):
+        service.filter_transactions_page(wallet, 10, "not a cursor")
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_all_transactions(
     service_name: str, request: pytest.FixtureRequest
@@ -187,11 +702,17 @@ def test_get_all_transactions(
     service.create_transaction(transaction_2, None, False)
     all_transactions = service.get_all_transactions()
     assert len(all_transactions) == 2
+    transactions = service.iter_transactions(batch_size=1)
+    assert iter(transactions) is transactions
+    assert [str(t.transaction_id) for t in transactions] == [
+        str(transaction_1.transaction_id),
+        str(transaction_2.transaction_id),
+    ]
     service.tear_down()
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_profit(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -218,7 +739,33 @@ def test_get_profit(service_name: str, request: pytest.FixtureRequest) -> None:
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
+)
+def test_reconcile_statistics(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    transaction = (
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address("address_2")
+        .amount(50)
+        .build()
+    )
+    service.create_transaction(transaction, None, False)
+    skew_statistics(service)
+    assert service.get_transaction_count() != 1
+    assert service.get_profit() != 1
+
+    service.reconcile_statistics()
+    assert service.get_transaction_count() == 1
+    assert service.get_profit() == 1
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_transaction_count(
     service_name: str, request: pytest.FixtureRequest
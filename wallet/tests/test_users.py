@@ -1,8 +1,19 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from uuid import UUID
+
 import pytest
 
 from wallet.core.entity.user import UserBuilder
-from wallet.core.error.errors import AlreadyExistsError, DoesNotExistError
-from wallet.core.facade import UserService
+from wallet.core.error.errors import (
+    AlreadyExistsError,
+    DoesNotExistError,
+    WrongEmailError,
+)
+from wallet.core.facade import AsyncUserService, UserService
+from wallet.core.tool.user_parser import CSVUserParser
 from wallet.infra.repository.memory.user_repository import (
     UserRepository as InMemoryUserRepository,
 )
@@ -18,9 +29,11 @@ def service_in_mem_dict() -> UserService:
 
 
 @pytest.fixture
-def service_in_mem_sqlite() -> UserService:
+def service_in_mem_sqlite() -> Iterator[UserService]:
+    in_mem = ConnectionManager.in_mem
     ConnectionManager.set_in_mem(True)
-    return UserService(SQLiteUserRepository())
+    yield UserService(SQLiteUserRepository())
+    ConnectionManager.set_in_mem(in_mem)
 
 
 @pytest.mark.parametrize(
@@ -139,3 +152,75 @@ def test_not_found_api_key_by_email(
     with pytest.raises(DoesNotExistError):
         service.get_api_key_by_email("email@gmail.com")
     service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+)
+def test_get_user_by_api_key_is_cached(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    user = UserBuilder().builder().email("email@gmail.com").api_key("123").build()
+    service.create_user(user)
+    assert service.get_user_by_api_key("123").user_id == user.user_id
+    assert service.get_user_by_api_key("123").user_id == user.user_id
+    assert (service.api_key_cache.hits, service.api_key_cache.misses) == (1, 1)
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+)
+def test_async_user_service(service_name: str, request: pytest.FixtureRequest) -> None:
+    service = request.getfixturevalue(service_name)
+    user = UserBuilder().builder().email("email@gmail.com").api_key("123").build()
+
+    async def create_and_get() -> UUID:
+        with ThreadPoolExecutor() as executor:
+            async_service = AsyncUserService(service, executor)
+            await async_service.create_user(user)
+            return (await async_service.get_user_by_api_key("123")).user_id
+
+    assert asyncio.run(create_and_get()) == user.user_id
+    service.tear_down()
+
+
+@pytest.mark.parametrize(
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+)
+def test_import_users_reports_failures(
+    service_name: str, request: pytest.FixtureRequest
+) -> None:
+    service = request.getfixturevalue(service_name)
+    service.create_user(UserBuilder().builder().email("taken@gmail.com").build())
+    emails = ["a@gmail.com", "taken@gmail.com", "wrong", "b@gmail.com", "a@gmail.com"]
+    users = [UserBuilder().builder().email(email).build() for email in emails]
+
+    results = list(service.import_users(users, chunk_size=2))
+
+    assert [result.succeeded for result in results] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert isinstance(results[1].error, AlreadyExistsError)
+    assert isinstance(results[2].error, WrongEmailError)
+    assert isinstance(results[4].error, AlreadyExistsError)
+    for result in results:
+        if result.succeeded:
+            assert service.get_user_by_api_key(result.item.api_key) == result.item
+    service.tear_down()
+
+
+def test_csv_parser_reads_quoted_newlines() -> None:
+    lines = io.StringIO(
+        'name,Email\r\n"Multi\r\nline",a@gmail.com\r\n\r\n"b, c",b@gmail.com\r\n',
+        newline="",
+    )
+
+    users = list(CSVUserParser().parse(lines))
+
+    assert [user.email for user in users] == ["a@gmail.com", "b@gmail.com"]
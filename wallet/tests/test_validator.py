@@ -0,0 +1,20 @@
+from wallet.core.entity.user import UserBuilder
+from wallet.core.error.errors import WrongEmailError
+from wallet.core.tool.validator import DefaultValidator
+
+
+def test_is_valid_email() -> None:
+    assert DefaultValidator.is_valid_email("first.last+tag@sub.example.com")
+    assert not DefaultValidator.is_valid_email("not-an-email")
+    assert not DefaultValidator.is_valid_email("user@localhost")
+
+
+def test_validate_users() -> None:
+    users = [
+        UserBuilder().builder().email(email).build()
+        for email in ["user@gmail.com", "wrong", "other@gmail.com"]
+    ]
+    results = DefaultValidator.validate_users(users)
+    assert [result.item for result in results] == users
+    assert [result.succeeded for result in results] == [True, False, True]
+    assert isinstance(results[1].error, WrongEmailError)
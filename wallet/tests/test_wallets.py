@@ -1,3 +1,5 @@
+from typing import Iterator
+
 import pytest
 
 from wallet.core.entity.user import UserBuilder
@@ -7,6 +9,10 @@ from wallet.core.facade import WalletService
 from wallet.infra.repository.memory.wallet_repository import (
     WalletRepository as InMemoryWalletRepository,
 )
+from wallet.infra.repository.sharded.ledger import ShardedLedger
+from wallet.infra.repository.sharded.wallet_repository import (
+    WalletRepository as ShardedWalletRepository,
+)
 from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
 from wallet.infra.repository.sqlite.wallet_repository import (
     WalletRepository as SQLiteWalletRepository,
@@ -19,14 +25,24 @@ def service_in_mem_dict() -> WalletService:
 
 
 @pytest.fixture
-def service_in_mem_sqlite() -> WalletService:
+def service_in_mem_sqlite() -> Iterator[WalletService]:
+    in_mem = ConnectionManager.in_mem
     ConnectionManager.set_in_mem(True)
     ConnectionManager.set_foreign_keys(False)
-    return WalletService(SQLiteWalletRepository())
+    yield WalletService(SQLiteWalletRepository())
+    ConnectionManager.set_in_mem(in_mem)
+
+
+@pytest.fixture
+def service_sharded() -> Iterator[WalletService]:
+    ledger = ShardedLedger(4)
+    ledger.start()
+    yield WalletService(ShardedWalletRepository(ledger))
+    ledger.stop()
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_create_wallet(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -36,7 +52,7 @@ def test_create_wallet(service_name: str, request: pytest.FixtureRequest) -> Non
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_wallet(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -48,7 +64,7 @@ def test_get_wallet(service_name: str, request: pytest.FixtureRequest) -> None:
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_not_found_wallet(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -58,7 +74,7 @@ def test_not_found_wallet(service_name: str, request: pytest.FixtureRequest) ->
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_not_found_wallet_on_update(
     service_name: str, request: pytest.FixtureRequest
@@ -70,7 +86,7 @@ def test_not_found_wallet_on_update(
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_already_exists_wallet(
     service_name: str, request: pytest.FixtureRequest
@@ -84,7 +100,7 @@ def test_already_exists_wallet(
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_get_user_wallets(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -124,7 +140,7 @@ def test_get_user_wallets(service_name: str, request: pytest.FixtureRequest) ->
 
 
 @pytest.mark.parametrize(
-    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite"]
+    "service_name", ["service_in_mem_dict", "service_in_mem_sqlite", "service_sharded"]
 )
 def test_update_amount(service_name: str, request: pytest.FixtureRequest) -> None:
     service = request.getfixturevalue(service_name)
@@ -0,0 +1,284 @@
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+from uuid import uuid4
+
+import pytest
+
+from wallet.core.entity.transaction import Transaction, TransactionBuilder
+from wallet.core.entity.user import UserBuilder
+from wallet.core.entity.wallet import Wallet
+from wallet.core.error.errors import (
+    DoesNotExistError,
+    NotEnoughBalanceError,
+    PersistenceError,
+)
+from wallet.core.facade import TransactionService
+from wallet.infra.repository.memory.transaction_repository import (
+    TransactionRepository as InMemoryTransactionRepository,
+)
+from wallet.infra.repository.memory.unit_of_work import (
+    UnitOfWork as InMemoryUnitOfWork,
+)
+from wallet.infra.repository.memory.wallet_repository import (
+    WalletRepository as InMemoryWalletRepository,
+)
+from wallet.infra.repository.sqlite.connection_manager import ConnectionManager
+from wallet.infra.repository.sqlite.transaction_repository import (
+    TransactionRepository as SQLiteTransactionRepository,
+)
+from wallet.infra.repository.sqlite.unit_of_work import UnitOfWork as SQLiteUnitOfWork
+from wallet.infra.repository.sqlite.wallet_repository import (
+    WalletRepository as SQLiteWalletRepository,
+)
+from wallet.infra.repository.write_behind.ledger import LedgerLog, WriteBehindLedger
+from wallet.infra.repository.write_behind.transaction_repository import (
+    TransactionRepository,
+)
+from wallet.infra.repository.write_behind.unit_of_work import UnitOfWork
+from wallet.infra.repository.write_behind.wallet_repository import WalletRepository
+
+SENDER = UserBuilder().builder().email("sender@gmail.com").build()
+
+
+@pytest.fixture
+def backing_in_mem_dict() -> TransactionService:
+    wallet_repository = InMemoryWalletRepository()
+    return TransactionService(
+        InMemoryTransactionRepository(wallet_repository),
+        wallet_repository,
+        InMemoryUnitOfWork(wallet_repository.locks),
+    )
+
+
+@pytest.fixture
+def backing_in_mem_sqlite() -> Iterator[TransactionService]:
+    in_mem = ConnectionManager.in_mem
+    ConnectionManager.set_foreign_keys(False)
+    ConnectionManager.set_in_mem(True)
+    backing = TransactionService(
+        SQLiteTransactionRepository(), SQLiteWalletRepository(), SQLiteUnitOfWork()
+    )
+    yield backing
+    backing.tear_down()
+    ConnectionManager.set_in_mem(in_mem)
+
+
+@pytest.fixture(params=["backing_in_mem_dict", "backing_in_mem_sqlite"])
+def backing(request: pytest.FixtureRequest) -> TransactionService:
+    backing: TransactionService = request.getfixturevalue(request.param)
+    backing.wallet_repository.create_wallet(Wallet("address_1", 100, uuid4()))
+    backing.wallet_repository.create_wallet(Wallet("address_2", 200, uuid4()))
+    return backing
+
+
+def write_behind(
+    backing: TransactionService, path: Path
+) -> Tuple[TransactionService, WriteBehindLedger]:
+    ledger = WriteBehindLedger(
+        backing.transaction_repository,
+        backing.wallet_repository,
+        backing.unit_of_work,
+        LedgerLog(str(path)),
+    )
+    service = TransactionService(
+        TransactionRepository(backing.transaction_repository, ledger),
+        WalletRepository(backing.wallet_repository, ledger),
+        UnitOfWork(ledger),
+    )
+    return service, ledger
+
+
+@pytest.fixture
+def service(
+    backing: TransactionService, tmp_path: Path
+) -> Iterator[TransactionService]:
+    service, ledger = write_behind(backing, tmp_path / "wallet.db-ledger")
+    yield service
+    ledger.log.close()
+
+
+def transfer(amount: int, to_address: str = "address_2") -> Transaction:
+    return (
+        TransactionBuilder()
+        .builder()
+        .from_address("address_1")
+        .to_address(to_address)
+        .amount(amount)
+        .build()
+    )
+
+
+def test_transfer_applied_in_memory_before_flush(
+    service: TransactionService, backing: TransactionService
+) -> None:
+    service.create_transaction(transfer(50), SENDER, False)
+
+    assert service.wallet_repository.get_wallet("address_1").amount == 50
+    assert backing.wallet_repository.get_wallet("address_1").amount == 100
+    assert backing.get_transaction_count() == 0
+
+    assert service.get_transaction_count() == 1
+    assert backing.wallet_repository.get_wallet("address_1").amount == 50
+    assert backing.wallet_repository.get_wallet("address_2").amount == 250
+
+
+def test_failed_transfer_leaves_no_trace(service: TransactionService) -> None:
+    with pytest.raises(NotEnoughBalanceError):
+        service.create_transaction(transfer(100), SENDER, False)
+    with pytest.raises(DoesNotExistError):
+        service.create_transaction(transfer(10, "address_3"), SENDER, False)
+
+    assert service.wallet_repository.get_wallet("address_1").amount == 100
+    assert service.get_transaction_count() == 0
+
+
+def test_streams_flush_when_iterated(
+    service: TransactionService, backing: TransactionService
+) -> None:
+    transaction = service.create_transaction(transfer(50), SENDER, False)
+
+    transactions = service.iter_transactions()
+    assert backing.get_transaction_count() == 0
+    assert [str(t.transaction_id) for t in transactions] == [
+        str(transaction.transaction_id)
+    ]
+    assert backing.get_transaction_count() == 1
+
+
+def test_update_amount_keeps_transfers_that_race_it(
+    service: TransactionService,
+    backing: TransactionService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    update_amount = backing.wallet_repository.update_amount
+    threads = []
+
+    def update_while_transferring(address: str, amount: int) -> Wallet:
+        wallet = update_amount(address, amount)
+        thread = threading.Thread(
+            target=service.create_transaction, args=(transfer(50), SENDER, False)
+        )
+        thread.start()
+        thread.join(0.1)
+        threads.append(thread)
+        return wallet
+
+    monkeypatch.setattr(
+        backing.wallet_repository, "update_amount", update_while_transferring
+    )
+    service.wallet_repository.update_amount("address_1", 1000)
+    threads[0].join()
+
+    assert service.wallet_repository.get_wallet("address_1").amount == 950
+    assert service.get_transaction_count() == 1
+    assert backing.wallet_repository.get_wallet("address_1").amount == 950
+
+
+def test_recovery_replays_unflushed_log(
+    backing: TransactionService, tmp_path: Path
+) -> None:
+    path = tmp_path / "wallet.db-ledger"
+    crashed, crashed_ledger = write_behind(backing, path)
+    transaction = crashed.create_transaction(transfer(50), SENDER, False)
+    crashed_ledger.log.sync()
+
+    _, ledger = write_behind(backing, path)
+    assert ledger.recover() == 1
+    assert ledger.recover() == 0
+    assert backing.get_transaction_by_id(transaction.transaction_id).amount == 50
+    assert backing.wallet_repository.get_wallet("address_1").amount == 50
+    assert path.stat().st_size == 0
+
+
+def test_recovery_skips_torn_last_record(
+    backing: TransactionService, tmp_path: Path
+) -> None:
+    path = tmp_path / "wallet.db-ledger"
+    crashed, _ = write_behind(backing, path)
+    transaction = crashed.create_transaction(transfer(50), SENDER, False)
+    with path.open("a", encoding="utf-8") as log:
+        log.write(f'["{uuid4()}", "address_1", "addr')
+
+    _, ledger = write_behind(backing, path)
+    assert ledger.recover() == 1
+    assert ledger.log.replay() == []
+    assert backing.get_transaction_by_id(transaction.transaction_id).amount == 50
+    assert backing.get_transaction_count() == 1
+    assert backing.wallet_repository.get_wallet("address_1").amount == 50
+    ledger.log.close()
+
+
+def test_worker_flushes_periodically(
+    backing: TransactionService, tmp_path: Path
+) -> None:
+    service, ledger = write_behind(backing, tmp_path / "wallet.db-ledger")
+    ledger.flush_interval = 10
+    ledger.start()
+    service.create_transaction(transfer(50), SENDER, False)
+
+    deadline = time.monotonic() + 5
+    while backing.get_transaction_count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backing.get_transaction_count() == 1
+    assert backing.wallet_repository.get_wallet("address_2").amount == 250
+    ledger.stop()
+
+
+def test_log_is_compacted_while_transfers_keep_coming(
+    backing: TransactionService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "wallet.db-ledger"
+    service, ledger = write_behind(backing, path)
+    create_transactions = backing.transaction_repository.create_transactions
+
+    def create_during_flush(transactions: List[Transaction]) -> None:
+        create_transactions(transactions)
+        service.create_transaction(transfer(1), SENDER, False)
+
+    monkeypatch.setattr(
+        backing.transaction_repository, "create_transactions", create_during_flush
+    )
+    service.create_transaction(transfer(1), SENDER, False)
+    for _ in range(50):
+        ledger.flush()
+        assert len(ledger.pending) == 1
+        assert ledger.log.replay() == ledger.pending
+
+    monkeypatch.setattr(
+        backing.transaction_repository, "create_transactions", create_transactions
+    )
+    _, recovered = write_behind(backing, path)
+    assert recovered.recover() == 1
+    assert backing.wallet_repository.get_wallet("address_1").amount == 49
+    ledger.log.close()
+    recovered.log.close()
+
+
+def test_failed_flush_stops_worker_and_is_raised(
+    backing: TransactionService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(transactions: List[Transaction]) -> None:
+        raise OSError("disk full")
+
+    path = tmp_path / "wallet.db-ledger"
+    service, ledger = write_behind(backing, path)
+    monkeypatch.setattr(backing.transaction_repository, "create_transactions", fail)
+    ledger.flush_interval = 10
+    ledger.start()
+    service.create_transaction(transfer(50), SENDER, False)
+
+    assert ledger.thread is not None
+    ledger.thread.join(5)
+    assert not ledger.thread.is_alive()
+    assert isinstance(ledger.failure, OSError)
+    with pytest.raises(PersistenceError):
+        service.create_transaction(transfer(10), SENDER, False)
+    with pytest.raises(PersistenceError):
+        ledger.flush()
+    with pytest.raises(PersistenceError):
+        ledger.stop()
+    log = LedgerLog(str(path))
+    assert len(log.replay()) == 1
+    log.close()